@@ -8,36 +8,90 @@ import sys
 import json
 from pathlib import Path
 
-MODULES_DIR = os.path.abspath('./modules')
+# orjson is an optional, faster drop-in for the JSON parsing below
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# ijson lets 'show <key>' stream a single top-level entry instead of parsing the whole file
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+MODULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'modules')
 sys.path.append(MODULES_DIR)
 import system_info
-import prepare_protein
 
 CONFIG_DIR = Path.home() / ".bpcss"
 INFO_FILE = CONFIG_DIR / "system_info.json"
+# Parsed INFO_FILE contents, keyed by the file's mtime
+_info_cache = {'mtime': None, 'data': None}
 
 
 def print_formatted_info(info):
     """Print system info in a readable formatted manner."""
     try:
-        formatted = json.dumps(info, indent=2)
+        if ORJSON_AVAILABLE:
+            formatted = orjson.dumps(info, option=orjson.OPT_INDENT_2).decode()
+        else:
+            formatted = json.dumps(info, indent=2)
         print(formatted)
     except Exception as e:
         print(f"Failed to format system info: {e}")
 
 
 def load_info():
-    """Load stored system info JSON."""
-    if INFO_FILE.exists():
+    """Load stored system info JSON, reusing the parsed data while the file is unchanged."""
+    try:
+        st = INFO_FILE.stat()
+    except FileNotFoundError:
+        print(f"System info file not found at {INFO_FILE}.")
+        return None
+    except OSError as e:
+        print(f"Error loading system info JSON: {e}")
+        return None
+    if st.st_mtime_ns == _info_cache['mtime']:
+        return _info_cache['data']
+    try:
+        with open(INFO_FILE, 'rb') as f:
+            data = f.read()
+        info = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    except Exception as e:
+        print(f"Error loading system info JSON: {e}")
+        return None
+    _info_cache['mtime'] = st.st_mtime_ns
+    _info_cache['data'] = info
+    return info
+
+
+def load_info_key(key):
+    """Load a single top-level entry of the system info JSON, streaming it when possible."""
+    try:
+        st = INFO_FILE.stat()
+    except OSError:
+        return load_info()
+    if st.st_mtime_ns == _info_cache['mtime'] or not IJSON_AVAILABLE:
+        info = load_info()
+        if info is None:
+            return None
+    else:
         try:
-            with open(INFO_FILE) as f:
-                return json.load(f)
+            with open(INFO_FILE, 'rb') as f:
+                for k, v in ijson.kvitems(f, '', use_float=True):
+                    if k == key:
+                        return {k: v}
         except Exception as e:
             print(f"Error loading system info JSON: {e}")
             return None
-    else:
-        print(f"System info file not found at {INFO_FILE}.")
+        info = {}
+    if key not in info:
+        print(f"No '{key}' entry in system info.")
         return None
+    return {key: info[key]}
 
 logo = r"""
   ____  ____  ____  ____  ____  
@@ -82,21 +136,24 @@ def main():
     print("\nEnter 'show' to display system info, 'clear' to clear screen, or 'exit' to quit.")
     while True:
         try:
-            cmd = input("bpcss> ").strip().lower()
+            cmd, _, arg = input("bpcss> ").strip().partition(' ')
+            cmd, arg = cmd.lower(), arg.strip()
         except EOFError:
             print()
             break
         if cmd in ('exit', 'quit'):
             break
         elif cmd in ('show', 'info'):
-            info = load_info()
+            info = load_info_key(arg) if arg else load_info()
             if info:
                 print_formatted_info(info)
         elif cmd == 'clear':
             clear_screen()
         elif cmd in ('help', '?'):
-            print("Commands:\n  show/info - display system info\n  clear - clear the screen\n  pp - prepare protein\n  exit/quit - exit the program")
+            print("Commands:\n  show/info [key] - display system info (or one entry)\n  clear - clear the screen\n  pp - prepare protein\n  exit/quit - exit the program")
         elif cmd == 'pp':
+            # imported on demand: NumPy/Biopython are not needed for the rest of the REPL
+            import prepare_protein
             prepare_protein.prepare_protein()
         elif cmd == '':
             continue
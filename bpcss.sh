@@ -119,7 +119,7 @@ fi
 source "$VENV_DIR/bin/activate"
 
 # Install required Python packages
-REQUIREMENTS=(biopython pyyaml matplotlib scipy selenium requests tqdm pandas beautifulsoup4)
+REQUIREMENTS=(biopython numpy pyyaml matplotlib scipy selenium requests tqdm pandas beautifulsoup4)
 echo "Installing required Python packages..."
 pip install --upgrade pip
 for pkg in "${REQUIREMENTS[@]}"; do
@@ -14,141 +14,387 @@ Features:
 """
 import os
 import sys
-import requests
+import pickle
+import functools
+import hashlib
+import gzip
+import json
+import multiprocessing
+import atexit
+import threading
+import secrets
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
 from pathlib import Path
+from io import StringIO
 from Bio.PDB import PDBParser, PDBIO, Select
 from collections import defaultdict
 import re
+import difflib
+import heapq
 import webbrowser
 import shutil
+import tempfile
 
-# PyRosetta integration
-PYRO_AVAILABLE = False
-try:
-    import pyrosetta
-    from pyrosetta import pose_from_pdb
-    from pyrosetta.rosetta.core.scoring import get_score_function
-    from pyrosetta.rosetta.protocols.loops import Loops, Loop
-    try:
-        from pyrosetta.rosetta.protocols.loops.loop_mover.perturb import LoopMover_Perturb_KIC as KICMover
-    except ImportError:
-        try:
-            from pyrosetta.rosetta.protocols.loops.loop_mover.refine import LoopMover_Refine_KIC as KICMover
-        except ImportError:
-            KICMover = None
-    try:
-        from pyrosetta.rosetta.core.scoring.constraints import CoordinateConstraint
-    except ImportError:
-        CoordinateConstraint = None
-    PYRO_AVAILABLE = True
-    ROSINIT = False
-except ImportError:
-    KICMover = None
-    CoordinateConstraint = None
-    ROSINIT = False
+# PyRosetta integration: imported on first use by load_pyrosetta(), since loading it
+# takes seconds and most sessions never model loops. PYRO_AVAILABLE is None until tried.
+PYRO_AVAILABLE = None
+ROSINIT = False
+_pyrosetta = None
+pyrosetta = pose_from_pdb = get_score_function = Loops = Loop = None
+KICMover = None
+CoordinateConstraint = None
 
-# MODELLER DOPE integration
-MODELLER_AVAILABLE = False
+# Numba compiles the PDB line scanner when installed; NumPy fallback otherwise
 try:
-    from modeller import Environ, Selection
-    from modeller.scripts import complete_pdb
-    MODELLER_AVAILABLE = True
+    from numba import njit
+    NUMBA_AVAILABLE = True
 except ImportError:
-    MODELLER_AVAILABLE = False
+    NUMBA_AVAILABLE = False
+
+# MODELLER DOPE integration, imported on first use by load_modeller()
+MODELLER_AVAILABLE = None
+Environ = Selection = complete_pdb = None
+DOPE_ENV = None
 
 # Base toolkit directory
 TOOLKIT_DIR = Path(__file__).resolve().parent
 OUTPUT_BASE = TOOLKIT_DIR / 'prepared_proteins'
+# Per-directory cache of scan results, keyed by file name, size and mtime
+CACHE_DIRNAME = '.bpcss_cache'
+# per-decoy scratch files go to tmpfs when present (None -> system temp dir)
+SCRATCH_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+# bump when the layout of disk-memoized results changes
+CACHE_VERSION = 2
+# Record kinds distinguished by the PDB scanner
+REC_OTHER, REC_ATOM, REC_HETATM, REC_SEQRES, REC_ENDMDL = range(5)
+RECORD_KINDS = {b'ATOM  ': REC_ATOM, b'HETATM': REC_HETATM, b'SEQRES': REC_SEQRES, b'ENDMDL': REC_ENDMDL}
+# Records carrying per-residue fields (resname, chain, resseq, icode)
+RESIDUE_RECORDS = (b'ATOM  ', b'HETATM', b'ANISOU', b'TER   ')
+# Localhost HTTP server for the 3D viewer, started on first use. It serves only the
+# URL paths registered in VIEWER_FILES (url path -> file); viewer pages live in VIEWER_DIR.
+VIEWER_SERVER = None
+VIEWER_DIR = None
+VIEWER_FILES = {}
+
+
+def load_pyrosetta():
+    global _pyrosetta, PYRO_AVAILABLE, pyrosetta, pose_from_pdb, get_score_function, Loops, Loop
+    global KICMover, CoordinateConstraint
+    if PYRO_AVAILABLE is None:
+        try:
+            import pyrosetta
+            from pyrosetta import pose_from_pdb
+            from pyrosetta.rosetta.core.scoring import get_score_function
+            from pyrosetta.rosetta.protocols.loops import Loops, Loop
+            try:
+                from pyrosetta.rosetta.protocols.loops.loop_mover.perturb import LoopMover_Perturb_KIC as KICMover
+            except ImportError:
+                try:
+                    from pyrosetta.rosetta.protocols.loops.loop_mover.refine import LoopMover_Refine_KIC as KICMover
+                except ImportError:
+                    KICMover = None
+            try:
+                from pyrosetta.rosetta.core.scoring.constraints import CoordinateConstraint
+            except ImportError:
+                CoordinateConstraint = None
+            _pyrosetta = pyrosetta
+            PYRO_AVAILABLE = True
+        except ImportError:
+            PYRO_AVAILABLE = False
+    return _pyrosetta
+
+
+def load_modeller():
+    global MODELLER_AVAILABLE, Environ, Selection, complete_pdb
+    if MODELLER_AVAILABLE is None:
+        try:
+            from modeller import Environ, Selection
+            from modeller.scripts import complete_pdb
+            MODELLER_AVAILABLE = True
+        except ImportError:
+            MODELLER_AVAILABLE = False
+    return MODELLER_AVAILABLE
 
 
 def init_pyrosetta():
     global ROSINIT
-    if PYRO_AVAILABLE and not ROSINIT:
+    if load_pyrosetta() is not None and not ROSINIT:
         pyrosetta.init(extra_options='-mute all')
         ROSINIT = True
 
 
 def fetch_pdb(pdb_id, out_dir):
+    import requests
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / f"{pdb_id.upper()}.pdb"
+    meta_path = out_dir / CACHE_DIRNAME / f"{out_path.name}.http.json"
+    headers = {}
     if out_path.exists():
         resp = input(f"{out_path} already exists. Overwrite? [y/N]: ").strip().lower()
         if resp not in ('y', 'yes'):
             print("Skipping download.")
             return out_path
-    url = f"https://files.rcsb.org/download/{pdb_id.upper()}.pdb"
+        # Only re-download if RCSB has a newer copy than the one we fetched last time
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        except Exception:
+            pass
+    url = f"https://files.rcsb.org/download/{pdb_id.upper()}.pdb.gz"
+    tmp_path = out_path.with_name(out_path.name + '.part')
     try:
-        resp = requests.get(url)
-        resp.raise_for_status()
-        with open(out_path, 'w') as f:
-            f.write(resp.text)
+        with requests.get(url, headers=headers, stream=True, timeout=30) as r:
+            if r.status_code == 304:
+                print(f"PDB {pdb_id} unchanged on RCSB; keeping {out_path}")
+                return out_path
+            r.raise_for_status()
+            # Stream-decompress straight to disk instead of buffering the whole entry
+            with gzip.GzipFile(fileobj=r.raw) as gz, open(tmp_path, 'wb') as f:
+                shutil.copyfileobj(gz, f, 1 << 16)
+            os.replace(tmp_path, out_path)
+            try:
+                _private_cache_dir(meta_path.parent)
+                with open(meta_path, 'w') as f:
+                    json.dump({'etag': r.headers.get('ETag'), 'last_modified': r.headers.get('Last-Modified')}, f)
+            except Exception:
+                pass
         print(f"Downloaded PDB {pdb_id} to {out_path}")
         return out_path
     except Exception as e:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
         print(f"Failed to fetch PDB {pdb_id}: {e}")
         return None
 
 
-def parse_seqres(pdb_path):
-    seqres = defaultdict(list)
-    try:
-        with open(pdb_path) as f:
-            for line in f:
-                if line.startswith('SEQRES'):
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        chain = parts[2]
-                        residues = parts[4:]
-                        seqres[chain].extend(residues)
-    except Exception:
-        pass
-    return dict(seqres)
+@functools.lru_cache(maxsize=8)
+def _parse_cached(path_str, mtime_ns):
+    parser = PDBParser(QUIET=True)
+    return parser.get_structure('structure', path_str)
 
 
 def parse_pdb_structure(pdb_path):
-    parser = PDBParser(QUIET=True)
+    # Returns a structure shared with later calls for the same unchanged file;
+    # copy.deepcopy it before mutating
     try:
-        struct = parser.get_structure('structure', str(pdb_path))
-        return struct
+        return _parse_cached(str(pdb_path), Path(pdb_path).stat().st_mtime_ns)
     except Exception as e:
         print(f"Error parsing PDB: {e}")
         return None
 
 
-def list_chains_and_hets(pdb_path):
-    chains = set()
-    hets = defaultdict(set)
+def _owned_private(path):
+    # Only unpickle cache entries that we own and that nobody else can write
+    st = os.stat(path)
+    uid = getattr(os, 'getuid', None)
+    if uid is not None and st.st_uid != uid():
+        return False
+    return not st.st_mode & 0o022
+
+
+def _private_cache_dir(cache_dir):
+    # Create cache_dir as 0700; one of ours that a umask left group/world-writable is
+    # tightened, otherwise _owned_private would reject it and the cache never be read
+    cache_dir.mkdir(mode=0o700, exist_ok=True)
+    st = os.stat(cache_dir)
+    uid = getattr(os, 'getuid', None)
+    if st.st_mode & 0o022 and (uid is None or st.st_uid == uid()):
+        os.chmod(cache_dir, 0o700)
+    return cache_dir
+
+
+def disk_memoize(func):
+    # Two-tier memoization for per-file results: in-process LRU over a pickle cache on disk.
+    # Entries are keyed by name, size and mtime so edited files are rescanned. If func
+    # raises, the exception propagates and nothing is cached.
+    @functools.lru_cache(maxsize=32)
+    def cached(path_str, key):
+        cache_dir = Path(path_str).parent / CACHE_DIRNAME
+        cache_file = cache_dir / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.pkl"
+        try:
+            _private_cache_dir(cache_dir)
+            if _owned_private(cache_dir) and _owned_private(cache_file):
+                with open(cache_file, 'rb') as f:
+                    return pickle.load(f)
+        except Exception:
+            pass
+        result = func(path_str)
+        try:
+            _private_cache_dir(cache_dir)
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.chmod(tmp_file, 0o600)
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            pass
+        return result
+
+    @functools.wraps(func)
+    def wrapper(pdb_path):
+        pdb_path = Path(pdb_path)
+        try:
+            st = pdb_path.stat()
+        except OSError:
+            return func(pdb_path)
+        return cached(str(pdb_path), f"{func.__qualname__}:{pdb_path.name}:{st.st_size}:{st.st_mtime_ns}:v{CACHE_VERSION}")
+    return wrapper
+
+
+def _line_columns(raw, starts, ends, width):
+    # Gather the first `width` columns of each line into an (n_lines, width) uint8 array.
+    # raw must carry at least `width` trailing blanks; short lines are blank-padded.
+    cols = raw[starts[:, None] + np.arange(width)]
+    lengths = ends - starts
+    short = np.flatnonzero(lengths < width)
+    if short.size:
+        sub = cols[short]
+        sub[np.arange(width) >= lengths[short, None]] = ord(' ')
+        cols[short] = sub
+    return cols
+
+
+def _ordered_unique(values):
+    uniq, first = np.unique(values, return_index=True)
+    return uniq[np.argsort(first)].tolist()
+
+
+def _index_records_np(raw, size):
+    ends = np.flatnonzero(raw[:size] == ord('\n'))
+    if size and raw[size - 1] != ord('\n'):
+        ends = np.append(ends, size)
+    starts = np.concatenate(([0], ends[:-1] + 1)) if ends.size else ends
+    names = _line_columns(raw, starts, ends, 6).view('S6').ravel()
+    kinds = np.zeros(len(names), dtype=np.uint8)
+    for name, kind in RECORD_KINDS.items():
+        kinds[names == name] = kind
+    endmdl = np.flatnonzero(kinds == REC_ENDMDL)
+    n = endmdl[0] if endmdl.size else len(kinds)
+    return starts[:n], ends[:n], kinds[:n]
+
+
+if NUMBA_AVAILABLE:
+    _KEY_ATOM, _KEY_HETATM, _KEY_SEQRES, _KEY_ENDMDL = (
+        int.from_bytes(name, 'little') for name in (b'ATOM  ', b'HETATM', b'SEQRES', b'ENDMDL'))
+
+    @njit(cache=True)
+    def _index_records_nb(raw, size):
+        n = 0
+        for i in range(size):
+            if raw[i] == 10:
+                n += 1
+        if size and raw[size - 1] != 10:
+            n += 1
+        starts = np.empty(n, dtype=np.int64)
+        ends = np.empty(n, dtype=np.int64)
+        kinds = np.zeros(n, dtype=np.uint8)
+        line = 0
+        start = 0
+        for i in range(size + 1):
+            if i < size and raw[i] != 10:
+                continue
+            if i == size and start == size:
+                break
+            # pack the blank-padded record name (columns 1-6) into one integer
+            key = 0
+            for k in range(6):
+                c = raw[start + k] if start + k < i else 32
+                key |= np.int64(c) << (8 * k)
+            starts[line] = start
+            ends[line] = i
+            if key == _KEY_ATOM:
+                kinds[line] = REC_ATOM
+            elif key == _KEY_HETATM:
+                kinds[line] = REC_HETATM
+            elif key == _KEY_SEQRES:
+                kinds[line] = REC_SEQRES
+            elif key == _KEY_ENDMDL:
+                kinds[line] = REC_ENDMDL
+                break
+            line += 1
+            start = i + 1
+        return starts[:line], ends[:line], kinds[:line]
+
+
+def _index_records(raw, size):
+    # Line boundaries and record kinds of the first model; compiled with Numba when available
+    if NUMBA_AVAILABLE:
+        return _index_records_nb(raw, size)
+    return _index_records_np(raw, size)
+
+
+def _residue_numbers(rows):
+    # Per-chain residue numbers (int32) of consecutive coordinate rows.
+    # resname, chain, resseq and icode (columns 18-27) identify a residue
+    keys = np.ascontiguousarray(rows[:, 17:27]).view('V10').ravel()
+    new_res = np.ones(len(keys), dtype=bool)
+    new_res[1:] = keys[1:] != keys[:-1]
+    res_rows = rows[new_res]
+    res_seq = np.ascontiguousarray(res_rows[:, 22:26]).view('S4').ravel().astype(np.int32)
+    return {chr(c): res_seq[res_rows[:, 21] == c] for c in _ordered_unique(res_rows[:, 21])}
+
+
+def scan_pdb(pdb_path):
+    # Columnar scan of the fixed-width PDB text (first model only) collecting SEQRES,
+    # ATOM chains, HETATM sets and per-chain residue numbering
     try:
-        with open(pdb_path) as f:
-            for line in f:
-                record = line[:6].strip()
-                if record == 'ATOM':
-                    chain = line[21].strip()
-                    chains.add(chain)
-                elif record == 'HETATM':
-                    chain = line[21].strip()
-                    resname = line[17:20].strip()
-                    hets[chain].add(resname)
-    except Exception:
-        pass
-    return sorted(chains), {k: sorted(list(v)) for k, v in hets.items()}
+        return _scan_pdb(pdb_path)
+    except Exception as e:
+        print(f"Error scanning PDB {pdb_path}: {e}")
+        return {'seqres': {}, 'chains': [], 'hets': {}, 'discontinuities': {}, 'chain_resseqs': {}}
 
 
-def detect_numbering_discontinuities(structure):
+@disk_memoize
+def _scan_pdb(pdb_path):
+    # Raises on unreadable/malformed input so a partial result is never cached
+    seqres = {}
+    hets = defaultdict(set)
+    data = Path(pdb_path).read_bytes()
+    raw = np.frombuffer(data + b' ' * 80, dtype=np.uint8)
+    starts, ends, kinds = _index_records(raw, len(data))
+    is_atom = kinds == REC_ATOM
+    coord = is_atom | (kinds == REC_HETATM)
+    # SEQRES residues live in columns 20-70; column 71 is blank and separates rows
+    is_seqres = kinds == REC_SEQRES
+    seq_rows = _line_columns(raw, starts[is_seqres], ends[is_seqres], 71)
+    for c in _ordered_unique(seq_rows[:, 11]):
+        seqres[chr(c)] = seq_rows[seq_rows[:, 11] == c, 19:71].tobytes().decode('latin-1').split()
+    rows = _line_columns(raw, starts[coord], ends[coord], 27)
+    atom_rows = is_atom[coord]
+    chains = sorted({chr(c).strip() for c in np.unique(rows[atom_rows, 21]).tolist()})
+    for row in np.unique(rows[~atom_rows][:, [21, 17, 18, 19]], axis=0):
+        hets[chr(row[0]).strip()].add(row[1:].tobytes().decode('latin-1').strip())
+    resseqs = _residue_numbers(rows)
+    # polymer (ATOM) residues only, for scoring
+    chain_resseqs = _residue_numbers(rows[atom_rows])
+    return {
+        'seqres': seqres,
+        'chains': chains,
+        'hets': {k: sorted(v) for k, v in hets.items()},
+        'discontinuities': detect_numbering_discontinuities(resseqs),
+        'chain_resseqs': chain_resseqs,
+    }
+
+
+def detect_numbering_discontinuities(chain_resseqs):
     discontinuities = {}
-    for model in structure:
-        for chain in model:
-            resseqs = [res.id[1] for res in chain]
-            if not resseqs:
-                continue
-            jumps = []
-            prev = resseqs[0]
-            for curr in resseqs[1:]:
-                if curr - prev != 1:
-                    jumps.append((prev, curr))
-                prev = curr
-            if jumps:
-                discontinuities[chain.id] = jumps
+    for cid, resseqs in chain_resseqs.items():
+        seqs = np.asarray(resseqs, dtype=np.int32)
+        if seqs.size < 2:
+            continue
+        idx = np.flatnonzero(np.diff(seqs) != 1)
+        if idx.size:
+            discontinuities[cid] = list(zip(seqs[idx].tolist(), seqs[idx + 1].tolist()))
     return discontinuities
 
 
@@ -161,15 +407,12 @@ def detect_missing_residues(seqres_dict, structure):
             if not seqres:
                 continue
             observed = [res.get_resname() for res in chain if res.id[0].strip() == '']
+            # align observed residues onto SEQRES; unaligned SEQRES stretches are missing
+            sm = difflib.SequenceMatcher(a=seqres, b=observed, autojunk=False)
             miss = []
-            i = j = 0
-            while i < len(seqres) and j < len(observed):
-                if seqres[i] == observed[j]:
-                    i += 1; j += 1
-                else:
-                    miss.append((i+1, seqres[i])); i += 1
-            while i < len(seqres):
-                miss.append((i+1, seqres[i])); i += 1
+            for tag, i1, i2, _, _ in sm.get_opcodes():
+                if tag in ('delete', 'replace'):
+                    miss.extend((i+1, seqres[i]) for i in range(i1, i2))
             if miss:
                 missing[cid] = miss
     return missing
@@ -224,16 +467,33 @@ class CleanSelect(Select):
         return (chain, resname) in self.hets_to_keep
 
 
-def renumber_structure(structure, start=1):
-    for model in structure:
-        for chain in model:
-            current = start
-            for residue in list(chain):
-                residue.id = (' ', current, ' '); current += 1
-    return structure
+def renumber_pdb_text(in_path, out_path, start=1):
+    # Renumber residues per chain by rewriting columns 23-27 (resseq + icode) of the
+    # coordinate records directly, instead of a Bio.PDB parse/serialize round trip
+    counters = {}
+    prev_key = None
+    with open(in_path, 'rb') as src, open(out_path, 'wb') as dst:
+        for line in src:
+            # work on the record body; the original line terminator (LF or CRLF) is written back
+            body = line.rstrip(b'\r\n'); eol = line[len(body):]
+            record = body[:6]
+            if record == b'MODEL ':
+                counters = {}; prev_key = None
+            elif record in RESIDUE_RECORDS and len(body) >= 26:
+                # short records (e.g. TER without an icode column) are padded to column 27
+                padded = body.ljust(27)
+                # resname, chain, resseq and icode identify a residue
+                key = padded[17:27]; chain = padded[21:22]
+                if key != prev_key:
+                    counters[chain] = counters.get(chain, start - 1) + 1
+                    prev_key = key
+                new = padded[:22] + b'%4d ' % counters[chain] + padded[27:]
+                body = new if len(body) >= 27 else new[:len(body)]
+            dst.write(body + eol)
+    return out_path
 
 
-def save_structure_with_check(structure, out_path):
+def confirm_output_path(out_path):
     out_path = Path(out_path)
     if out_path.exists():
         resp = input(f"{out_path} exists. Overwrite? [y/N]: ").strip().lower()
@@ -241,18 +501,81 @@ def save_structure_with_check(structure, out_path):
             new_name = input("Enter new filename (or leave blank to skip saving): ").strip()
             if not new_name: print("Skipping save."); return None
             out_path = out_path.with_name(new_name)
-    io = PDBIO(); io.set_structure(structure); io.save(str(out_path))
+    return out_path
+
+
+def save_structure_with_check(structure, out_path, select=None):
+    out_path = confirm_output_path(out_path)
+    if out_path is None: return None
+    io = PDBIO(); io.set_structure(structure); io.save(str(out_path), select or Select())
     print(f"Saved PDB: {out_path}")
     return out_path
 
 
+class _ViewerRequestHandler(BaseHTTPRequestHandler):
+    # whitelist only: anything not registered in VIEWER_FILES is a 404
+    def do_GET(self):
+        self._send_file(head=False)
+
+    def do_HEAD(self):
+        self._send_file(head=True)
+
+    def _send_file(self, head):
+        path = VIEWER_FILES.get(self.path.split('?', 1)[0])
+        try:
+            data = path.read_bytes() if path is not None else None
+        except OSError:
+            data = None
+        if data is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8' if path.suffix == '.html' else 'text/plain')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if not head:
+            self.wfile.write(data)
+
+    # keep request logging out of the interactive prompt
+    def log_message(self, format, *args):
+        pass
+
+
+def get_viewer_server():
+    # Serve registered viewer files over localhost so pages can fetch their PDB (file:// pages cannot)
+    global VIEWER_SERVER, VIEWER_DIR
+    if VIEWER_SERVER is None:
+        VIEWER_DIR = Path(tempfile.mkdtemp(prefix='bpcss_viewer_'))
+        VIEWER_SERVER = ThreadingHTTPServer(('127.0.0.1', 0), _ViewerRequestHandler)
+        threading.Thread(target=VIEWER_SERVER.serve_forever, daemon=True).start()
+        atexit.register(shutdown_viewer_server)
+    return VIEWER_SERVER
+
+
+def shutdown_viewer_server():
+    global VIEWER_SERVER, VIEWER_DIR
+    if VIEWER_SERVER is not None:
+        VIEWER_SERVER.shutdown()
+        VIEWER_SERVER.server_close()
+        VIEWER_SERVER = None
+    VIEWER_FILES.clear()
+    if VIEWER_DIR is not None:
+        shutil.rmtree(VIEWER_DIR, ignore_errors=True)
+        VIEWER_DIR = None
+
+
 def display_3d_structure(pdb_path):
     try:
         import py3Dmol
     except ImportError:
         print("py3Dmol not installed; install via 'pip install py3Dmol' to enable 3D display.")
         return
-    with open(pdb_path) as f: pdb_txt = f.read().replace('`', "'")
+    pdb_path = Path(pdb_path).resolve()
+    port = get_viewer_server().server_address[1]
+    # each view gets an unguessable URL prefix under which only its page and PDB are served
+    token = secrets.token_urlsafe(16)
+    pdb_url = f"/{token}/{quote(pdb_path.name)}"
     html = f"""
 <html>
 <head>
@@ -262,36 +585,34 @@ def display_3d_structure(pdb_path):
 <div id="viewer" style="width: 400px; height: 300px; position: relative; margin: auto;"></div>
 <script>
   let viewer = $3Dmol.createViewer("viewer", {{backgroundColor: 'white'}});
-  viewer.addModel(`{pdb_txt}`, "pdb");
-  viewer.setStyle({{chain: ''}}, {{cartoon: {{color: 'spectrum'}}}});
-  viewer.zoomTo(); viewer.render();
+  fetch("{pdb_url}").then(resp => resp.text()).then(pdb => {{
+    viewer.addModel(pdb, "pdb");
+    viewer.setStyle({{chain: ''}}, {{cartoon: {{color: 'spectrum'}}}});
+    viewer.zoomTo(); viewer.render();
+  }});
 </script>
 </body>
 </html>
 """
-    tmp_html = Path('/tmp') / f"view_{Path(pdb_path).stem}.html"
-    with open(tmp_html, 'w') as f: f.write(html)
-    webbrowser.open(f"file://{tmp_html}")
-    print(f"Opened 3D view in browser: {tmp_html}")
+    view_html = VIEWER_DIR / f"view_{token}.html"
+    with open(view_html, 'w') as f: f.write(html)
+    VIEWER_FILES[pdb_url] = pdb_path
+    VIEWER_FILES[f"/{token}/view.html"] = view_html
+    url = f"http://127.0.0.1:{port}/{token}/view.html"
+    webbrowser.open(url)
+    print(f"Opened 3D view in browser: {url}")
 
 
-def score_structure(seqres_dict, structure):
+def score_structure(seqres_dict, chain_resseqs):
+    # chain_resseqs: per-chain int arrays of observed polymer residue numbers (see scan_pdb)
     total_expected=total_missing=total_jumps=0
-    for model in structure:
-        for chain in model:
-            cid=chain.id; seqres=seqres_dict.get(cid)
-            if not seqres: continue
-            expected=len(seqres)
-            observed=sum(1 for res in chain if res.id[0].strip()=='')
-            missing=expected-observed; discontinuities=0; prev=None
-            for res in chain:
-                if res.id[0].strip()!='': continue
-                resseq=res.id[1]
-                if prev is None: prev=resseq
-                else:
-                    if resseq-prev!=1: discontinuities+=1
-                    prev=resseq
-            total_expected+=expected; total_missing+=max(missing,0); total_jumps+=discontinuities
+    for cid, resseqs in chain_resseqs.items():
+        seqres=seqres_dict.get(cid)
+        if not seqres: continue
+        expected=len(seqres)
+        total_expected+=expected
+        total_missing+=max(expected-len(resseqs), 0)
+        total_jumps+=int((np.diff(resseqs)!=1).sum())
     if total_expected==0: return 0
     score=100 - (total_missing*1) - (total_jumps*5)
     return max(0, min(100, score))
@@ -307,14 +628,22 @@ def strip_heteroatoms(input_pdb, output_pdb):
     return output_pdb
 
 
-def compute_dope_score(pdb_path):
-    if not MODELLER_AVAILABLE:
-        return None
-    try:
+def get_dope_environ():
+    # Reading the topology/parameter libraries dominates DOPE scoring; do it once per process
+    global DOPE_ENV
+    if DOPE_ENV is None:
         env = Environ()
         env.libs.topology.read(file='$(LIB)/top_heav.lib')
         env.libs.parameters.read(file='$(LIB)/par.lib')
-        mdl = complete_pdb(env, str(pdb_path))
+        DOPE_ENV = env
+    return DOPE_ENV
+
+
+def compute_dope_score(pdb_path):
+    if not load_modeller():
+        return None
+    try:
+        mdl = complete_pdb(get_dope_environ(), str(pdb_path))
         total = 0.0
         count = 0
         for chain in mdl.chains:
@@ -336,28 +665,182 @@ def merge_modeled_loops(cleaned_pdb, modeled_pdb, out_pdb):
     parser=PDBParser(QUIET=True)
     struct_clean=parser.get_structure('cleaned', str(cleaned_pdb))
     struct_model=parser.get_structure('modeled', str(modeled_pdb))
+    model_chain_maps=[{c.id: c for c in m} for m in struct_model]
     for model_clean in struct_clean:
         for chain_clean in model_clean:
-            cid=chain_clean.id; chain_model=None
-            for model2 in struct_model:
-                if cid in [c.id for c in model2]: chain_model=model2[cid]; break
-            if not chain_model: continue
+            cid=chain_clean.id
+            chain_model=next((mm[cid] for mm in model_chain_maps if cid in mm), None)
+            if chain_model is None: continue
             for res_model in chain_model:
-                res_id=res_model.id
-                if res_id in chain_clean:
-                    res_clean=chain_clean[res_id]
-                else: continue
+                res_clean=chain_clean.child_dict.get(res_model.id)
+                if res_clean is None: continue
+                clean_atoms={atom.get_name(): atom for atom in res_clean}
                 for atom_model in res_model:
-                    name=atom_model.get_name()
-                    if name in res_clean:
-                        atom_clean=res_clean[name]; atom_clean.set_coord(atom_model.get_coord())
+                    atom_clean=clean_atoms.get(atom_model.get_name())
+                    if atom_clean is not None: atom_clean.set_coord(atom_model.get_coord())
     io=PDBIO(); io.set_structure(struct_clean); io.save(str(out_pdb))
     print(f"Merged modeled loops + heteroatoms saved to {out_pdb}")
     return out_pdb
 
 
+# Score functions by weight set name, shared by everything run in this process
+SCORE_FUNCTIONS = {}
+# Decoy workers are kept for the whole session so PyRosetta init, score functions and
+# FastRelax setup are paid once per worker rather than once per modeling run
+DECOY_POOL = None
+DECOY_POOL_WORKERS = 0
+# Centroid (score3) prefilter: once PREFILTER_MIN_SAMPLES cheap scores are known, only decoys
+# scoring within the best PREFILTER_KEEP fraction seen so far go on to FastRelax
+PREFILTER_MIN_SAMPLES = 4
+PREFILTER_KEEP = 0.5
+# Per-process state of a decoy worker: relax mover plus the pose/loop mover of the current job
+_DECOY_WORKER = {}
+
+
+def get_cached_score_function(weights=None):
+    key = weights or 'default'
+    if key not in SCORE_FUNCTIONS:
+        SCORE_FUNCTIONS[key] = pyrosetta.create_score_function(weights) if weights else get_score_function()
+    return SCORE_FUNCTIONS[key]
+
+
+def get_decoy_pool(workers):
+    # Reuse the session pool when it has the size this run needs; otherwise rebuild it
+    global DECOY_POOL, DECOY_POOL_WORKERS
+    if DECOY_POOL is not None and DECOY_POOL_WORKERS != workers:
+        shutdown_decoy_pool()
+    if DECOY_POOL is None:
+        DECOY_POOL = ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context('spawn'),
+                                         initializer=_init_decoy_worker)
+        DECOY_POOL_WORKERS = workers
+    return DECOY_POOL
+
+
+def shutdown_decoy_pool(terminate=False):
+    # terminate=True kills workers still relaxing decoys instead of waiting for them;
+    # the decoy workers are the only multiprocessing children this module starts
+    global DECOY_POOL, DECOY_POOL_WORKERS
+    pool, DECOY_POOL, DECOY_POOL_WORKERS = DECOY_POOL, None, 0
+    if pool is None:
+        return
+    if terminate:
+        procs = multiprocessing.active_children()
+        pool.shutdown(wait=False)
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.join(timeout=5)
+    else:
+        pool.shutdown(wait=True)
+
+
+# never block interpreter exit on decoys nobody will read
+atexit.register(shutdown_decoy_pool, True)
+
+
+def _init_decoy_worker():
+    init_pyrosetta()
+    scorefxn = get_cached_score_function()
+    _DECOY_WORKER['scorefxn'] = scorefxn
+    try:
+        from pyrosetta.rosetta.protocols.relax import FastRelax
+        relax = FastRelax()
+        relax.set_scorefxn(scorefxn)
+        _DECOY_WORKER['relax'] = relax
+    except ImportError:
+        _DECOY_WORKER['relax'] = None
+    try:
+        from pyrosetta.rosetta.protocols.simple_moves import SwitchResidueTypeSetMover
+        _DECOY_WORKER['to_centroid'] = SwitchResidueTypeSetMover('centroid')
+        _DECOY_WORKER['cen_scorefxn'] = get_cached_score_function('score3')
+    except Exception:
+        _DECOY_WORKER['to_centroid'] = None
+
+
+def _centroid_score(pose):
+    # cheap score3 energy of a centroid copy of the post-KIC pose; None if unavailable
+    if _DECOY_WORKER.get('to_centroid') is None:
+        return None
+    try:
+        cen_pose = pose.clone()
+        _DECOY_WORKER['to_centroid'].apply(cen_pose)
+        return _DECOY_WORKER['cen_scorefxn'](cen_pose)
+    except Exception:
+        return None
+
+
+def _prefilter_threshold(cheap_scores):
+    # worst centroid score among the best PREFILTER_KEEP fraction seen so far
+    if len(cheap_scores) < PREFILTER_MIN_SAMPLES:
+        return None
+    keep = max(1, int(len(cheap_scores) * PREFILTER_KEEP))
+    return heapq.nsmallest(keep, cheap_scores)[-1]
+
+
+def _prepare_decoy_job(seq_input, loop_segments):
+    # (Re)build the starting pose and KIC mover only when the modeling job changes
+    job = (seq_input, tuple(loop_segments))
+    if _DECOY_WORKER.get('job') != job:
+        loops=Loops()
+        for (s,e) in loop_segments: loops.add_loop(Loop(s,e,s))
+        _DECOY_WORKER['full_pose'] = pyrosetta.pose_from_sequence(seq_input)
+        _DECOY_WORKER['loop_mover'] = KICMover(loops)
+        _DECOY_WORKER['job'] = job
+
+
+def _run_decoy(seq_input, loop_segments, attempt, threshold=None):
+    # Build, relax and score one decoy; returns (pdb_bytes, energy, dope, cheap, error).
+    # Decoys whose centroid score is above threshold skip relax and come back with only cheap set.
+    try:
+        _prepare_decoy_job(seq_input, loop_segments)
+    except Exception as e:
+        return None, None, None, None, f"Failed to set up loop modeling: {e}"
+    scorefxn = _DECOY_WORKER['scorefxn']
+    try:
+        test_pose = _DECOY_WORKER['full_pose'].clone()
+        _DECOY_WORKER['loop_mover'].apply(test_pose)
+    except Exception as e:
+        return None, None, None, None, f"Loop application failed: {e}"
+    cheap = _centroid_score(test_pose)
+    if threshold is not None and cheap is not None and cheap > threshold:
+        return None, None, None, cheap, None
+    if _DECOY_WORKER['relax'] is not None:
+        try:
+            _DECOY_WORKER['relax'].apply(test_pose)
+        except Exception as e:
+            return None, None, None, cheap, f"Relax failed: {e}"
+    try:
+        energy = scorefxn(test_pose)
+    except Exception as e:
+        return None, None, None, cheap, f"Rosetta scoring failed: {e}"
+    try:
+        pdb_bytes = pose_to_pdb_bytes(test_pose)
+    except Exception as e:
+        return None, None, None, cheap, f"Failed to dump PDB: {e}"
+    dope = None
+    if load_modeller():
+        # MODELLER only reads coordinates from files; use a short-lived scratch file
+        try:
+            tf = tempfile.NamedTemporaryFile(dir=SCRATCH_DIR, prefix=f"decoy_{attempt}_",
+                                             suffix='.pdb', delete=False)
+        except Exception as e:
+            return None, None, None, cheap, f"Failed to dump PDB for DOPE: {e}"
+        # the file exists from here on, so every exit path (failed write included) removes it
+        try:
+            try:
+                with tf:
+                    tf.write(pdb_bytes)
+            except Exception as e:
+                return None, None, None, cheap, f"Failed to dump PDB for DOPE: {e}"
+            dope = compute_dope_score(tf.name)
+        finally:
+            os.unlink(tf.name)
+    return pdb_bytes, energy, dope, cheap, None
+
+
 def handle_missing_residues(structure_path, seqres_dict, cleaned_path=None):
-    if not PYRO_AVAILABLE:
+    if load_pyrosetta() is None:
         print("PyRosetta not available; cannot model missing residues automatically.")
         return structure_path
     init_pyrosetta()
@@ -369,8 +852,7 @@ def handle_missing_residues(structure_path, seqres_dict, cleaned_path=None):
         print("Manual editing: please edit:", structure_path); input("Press Enter when done...")
         return structure_path
     tmp_stripped=Path('/tmp')/f"{structure_path.stem}_protein_only.pdb"
-    res=strip_heteroatoms(structure_path, tmp_stripped)
-    if res is None:
+    if strip_heteroatoms(structure_path, tmp_stripped) is None:
         print("Failed to strip heteroatoms."); return structure_path
     try:
         pose=pose_from_pdb(str(tmp_stripped))
@@ -380,31 +862,24 @@ def handle_missing_residues(structure_path, seqres_dict, cleaned_path=None):
     if not seq_input:
         print("No sequence provided; aborting loop modeling."); return structure_path
     try:
-        full_pose=pyrosetta.pose_from_sequence(seq_input)
+        # validate the sequence here; each decoy worker builds its own pose from it
+        pyrosetta.pose_from_sequence(seq_input)
     except Exception as e:
         print("Failed to create pose from sequence:", e); return structure_path
-    struct_prot=parse_pdb_structure(str(tmp_stripped))
-    missing=detect_missing_residues(seqres_dict, struct_prot)
-    loops=Loops()
+    # hetero residues are skipped by detect_missing_residues, so the cached parse serves as is
+    missing=detect_missing_residues(seqres_dict, parse_pdb_structure(structure_path))
+    loop_segments=[]
     for cid, miss_list in missing.items():
-        positions=[pos for pos,_ in miss_list]; segments=[]; start=prev=None
+        positions=[pos for pos,_ in miss_list]; start=prev=None
         for pos in positions:
             if start is None: start=pos; prev=pos
             elif pos==prev+1: prev=pos
-            else: segments.append((start,prev)); start=pos; prev=pos
-        if start is not None: segments.append((start,prev))
-        for (s,e) in segments: loops.add_loop(Loop(s,e,s))
+            else: loop_segments.append((start,prev)); start=pos; prev=pos
+        if start is not None: loop_segments.append((start,prev))
     if KICMover is None:
         print("No KIC mover available; cannot model loops automatically."); return structure_path
-    if loops.num_loop()==0:
+    if not loop_segments:
         print("No missing segments for loop modeling."); return structure_path
-    loop_mover=KICMover(loops)
-    scorefxn=get_score_function()
-    try:
-        from pyrosetta.rosetta.protocols.relax import FastRelax
-        relax_available=True
-    except ImportError:
-        relax_available=False
     try:
         n_decoys = int(input("Enter number of successful decoys to generate (e.g., 5): ").strip() or "5")
     except Exception:
@@ -412,59 +887,69 @@ def handle_missing_residues(structure_path, seqres_dict, cleaned_path=None):
     max_attempts = n_decoys * 10
     success_count = 0
     attempt = 0
-    best_pose = None
+    best_pdb = None
     best_score = float('inf')
-    print(f"Attempting to obtain {n_decoys} successful decoys (max {max_attempts})...")
-    while success_count < n_decoys and attempt < max_attempts:
-        attempt += 1
-        print(f"Attempt {attempt} (success so far: {success_count})...")
-        try:
-            test_pose = full_pose.clone()
-            loop_mover.apply(test_pose)
-        except Exception as e:
-            print(f"  Loop application failed: {e}")
-            continue
-        if relax_available:
-            try:
-                relax = FastRelax()
-                relax.set_scorefxn(scorefxn)
-                relax.apply(test_pose)
-            except Exception as e:
-                print(f"  Relax failed: {e}")
-                continue
-        try:
-            energy = scorefxn(test_pose)
-        except Exception as e:
-            print(f"  Rosetta scoring failed: {e}")
-            continue
-        tmp_pdb = Path('/tmp') / f"decoy_{attempt}.pdb"
-        try:
-            test_pose.dump_pdb(str(tmp_pdb))
-        except Exception as e:
-            print(f"  Failed to dump PDB for DOPE: {e}")
-            continue
-        if MODELLER_AVAILABLE:
-            dope = compute_dope_score(tmp_pdb)
-        else:
-            dope = None
-        if dope is not None:
-            combined = energy + 0.1 * dope
-        else:
-            combined = energy
-        print(f"  Decoy {attempt}: Rosetta energy={energy:.2f}, DOPE={dope}, combined={combined:.2f}")
-        success_count += 1
-        if combined < best_score:
-            best_score = combined
-            best_pose = test_pose.clone()
+    cheap_scores = []
+    rejected = 0
+    # Decoys are independent, so farm them out to a pool of spawned PyRosetta processes
+    workers = max(1, min(os.cpu_count() or 1, n_decoys))
+    print(f"Attempting to obtain {n_decoys} successful decoys (max {max_attempts}, {workers} workers)...")
+    pool = get_decoy_pool(workers)
+    pending = {}
+    try:
+        while success_count < n_decoys and (pending or attempt < max_attempts):
+            # never more jobs in flight than decoys still needed, so none are left
+            # running once the target is reached and the session pool can be reused
+            while attempt < max_attempts and len(pending) < min(workers, n_decoys - success_count):
+                attempt += 1
+                print(f"Attempt {attempt} (success so far: {success_count})...")
+                threshold = _prefilter_threshold(cheap_scores)
+                pending[pool.submit(_run_decoy, seq_input, loop_segments, attempt, threshold)] = attempt
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                n = pending.pop(fut)
+                pdb_bytes, energy, dope, cheap, error = fut.result()
+                if cheap is not None:
+                    cheap_scores.append(cheap)
+                if error:
+                    print(f"  Attempt {n}: {error}")
+                    continue
+                if pdb_bytes is None:
+                    rejected += 1
+                    print(f"  Attempt {n}: centroid score {cheap:.2f} not among the best; relax skipped")
+                    continue
+                if dope is not None:
+                    combined = energy + 0.1 * dope
+                else:
+                    combined = energy
+                print(f"  Decoy {n}: Rosetta energy={energy:.2f}, DOPE={dope}, combined={combined:.2f}")
+                success_count += 1
+                if combined < best_score:
+                    best_score = combined
+                    best_pdb = pdb_bytes
+    except BrokenProcessPool as e:
+        print(f"Decoy worker pool failed: {e}")
+        shutdown_decoy_pool(terminate=True)
+        pending = {}
+    finally:
+        # attempts still outstanding after an error or Ctrl-C are not needed: stop their
+        # workers rather than let them hold every core after we return
+        for fut in pending:
+            fut.cancel()
+        if any(not fut.done() for fut in pending):
+            shutdown_decoy_pool(terminate=True)
+    if rejected:
+        print(f"{rejected} decoys rejected by the centroid prefilter before relax.")
     if success_count < n_decoys:
         print(f"Only {success_count} successful decoys generated (requested {n_decoys}). Proceeding with best.")
-    if best_pose is None:
+    if best_pdb is None:
         print("No successful decoys; skipping automatic modeling.")
         return structure_path
     print(f"Best decoy combined score: {best_score:.2f}")
     out_modeled = structure_path.with_name(f"{structure_path.stem}_modeled.pdb")
     try:
-        best_pose.dump_pdb(str(out_modeled))
+        with open(out_modeled, 'wb') as f:
+            f.write(best_pdb)
         print(f"Best modeled structure saved to {out_modeled}")
     except Exception as e:
         print(f"Failed to save modeled PDB: {e}")
@@ -476,11 +961,16 @@ def handle_missing_residues(structure_path, seqres_dict, cleaned_path=None):
     else:
         return out_modeled
 
-# Helper: convert PyRosetta Pose to Bio.PDB structure via temporary file
+# Helper: serialize a PyRosetta Pose to PDB text in memory, without a disk round trip
+def pose_to_pdb_bytes(pose):
+    stream = pyrosetta.rosetta.std.ostringstream()
+    pose.dump_pdb(stream)
+    return stream.str().encode()
+
+# Helper: convert PyRosetta Pose to Bio.PDB structure
 def pose_to_structure(pose):
-    tmp = Path('/tmp') / 'temp_pose.pdb'
-    pose.dump_pdb(str(tmp))
-    return parse_pdb_structure(str(tmp))
+    parser = PDBParser(QUIET=True)
+    return parser.get_structure('structure', StringIO(pose_to_pdb_bytes(pose).decode()))
 
 def prepare_protein():
     choice = input("Do you have a local PDB file? [y/N]: ").strip().lower()
@@ -517,21 +1007,21 @@ def prepare_protein():
         if not pdb_path:
             return
     print(f"Working directory: {out_dir}")
-    struct = parse_pdb_structure(str(pdb_path))
-    if not struct:
+    base_struct = parse_pdb_structure(str(pdb_path))
+    if not base_struct:
         return
-    original_seqres = parse_seqres(str(pdb_path))
-    chains, hets = list_chains_and_hets(str(pdb_path))
+    scan = scan_pdb(pdb_path)
+    original_seqres, chains, hets = scan['seqres'], scan['chains'], scan['hets']
     print(f"Chains: {chains}")
     print(f"HETATM: {hets}")
-    discontinuities = detect_numbering_discontinuities(struct)
+    discontinuities = scan['discontinuities']
     if discontinuities:
         print("Numbering discontinuities:")
         for c, jumps in discontinuities.items():
             print(f"  Chain {c}: {jumps}")
     else:
         print("No numbering discontinuities.")
-    missing = detect_missing_residues(original_seqres, struct)
+    missing = detect_missing_residues(original_seqres, base_struct)
     if missing:
         print("Missing residues:")
         for c, miss in missing.items():
@@ -539,51 +1029,40 @@ def prepare_protein():
     else:
         print("No missing residues via SEQRES.")
     chosen_chains, chosen_hets = select_entities(chains, hets)
-    struct_orig = parse_pdb_structure(str(pdb_path))
-    io = PDBIO()
-    io.set_structure(struct_orig)
     cleaned_path = out_dir / f"{pdb_id}_cleaned.pdb"
-    struct_clean = struct_orig.copy()
-    io.set_structure(struct_clean)
-    saved = save_structure_with_check(struct_clean, cleaned_path)
+    select = CleanSelect(chains_to_keep=chosen_chains, hets_to_keep=chosen_hets)
+    saved = save_structure_with_check(base_struct, cleaned_path, select=select)
     if not saved:
         print("Cleaned PDB not saved; aborting.")
         return
-    io.set_structure(parse_pdb_structure(str(pdb_path)))
-    io.save(str(cleaned_path), CleanSelect(chains_to_keep=chosen_chains, hets_to_keep=chosen_hets))
-    struct2 = parse_pdb_structure(str(cleaned_path))
+    cleaned_path = saved
     print("Launching 3D view...")
     display_3d_structure(cleaned_path)
-    score_before = score_structure(original_seqres, struct2)
+    score_before = score_structure(original_seqres, scan_pdb(cleaned_path)['chain_resseqs'])
     print(f"Score before handling missing: {score_before}/100")
     if missing:
         new_path = handle_missing_residues(cleaned_path, original_seqres, cleaned_path)
-        struct2 = parse_pdb_structure(str(new_path))
-        score_mid = score_structure(original_seqres, struct2)
+        score_mid = score_structure(original_seqres, scan_pdb(new_path)['chain_resseqs'])
         print(f"Score after modeling & merge: {score_mid}/100")
     else:
         new_path = cleaned_path
     ren = input("Renumber residues contiguously starting at 1? [Y/n]: ").strip().lower()
     if ren in ('', 'y', 'yes'):
-        struct3 = parse_pdb_structure(str(new_path))
-        struct3 = renumber_structure(struct3, start=1)
         # choose output name depending on merged status
         if new_path.stem.endswith('_merged'):
             renum_name = f"{pdb_id}_cleaned_merged_renum.pdb"
         else:
             renum_name = f"{pdb_id}_cleaned_renum.pdb"
-        renum_path = out_dir / renum_name
-        saved2 = save_structure_with_check(struct3, renum_path)
-        if saved2:
-            struct_final = parse_pdb_structure(str(renum_path))
+        renum_path = confirm_output_path(out_dir / renum_name)
+        if renum_path:
+            renumber_pdb_text(new_path, renum_path, start=1)
+            print(f"Saved PDB: {renum_path}")
             final_path = renum_path
         else:
-            struct_final = struct2
             final_path = new_path
     else:
-        struct_final = struct2
         final_path = new_path
-    score_after = score_structure(original_seqres, struct_final)
+    score_after = score_structure(original_seqres, scan_pdb(final_path)['chain_resseqs'])
     print(f"Final score: {score_after}/100")
     print(f"Final PDB at {final_path}")
     return final_path
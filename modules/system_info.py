@@ -4,68 +4,161 @@
 # Avoids storing PII. Stores data in ~/.bpcss/system_info.json and detects changes between runs.
 
 import os
-import platform
 import json
-import subprocess
+import re
 from pathlib import Path
-import shutil
 import sys
+import functools
+import hashlib
+import time
+import threading
+# platform, shutil, subprocess, concurrent.futures and pynvml are imported inside the probes
+# that need them, so importing this module just to load or save the stored info stays cheap
+
+# orjson is an optional, faster drop-in for reading/writing INFO_FILE
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 CONFIG_DIR = Path.home() / ".bpcss"
 INFO_FILE = CONFIG_DIR / "system_info.json"
+# Parsed /proc/cpuinfo fields, reused until the host reboots (see _cpuinfo_cache_key)
+CPUINFO_FILE = CONFIG_DIR / "cpuinfo.json"
+BOOT_ID_FILE = '/proc/sys/kernel/random/boot_id'
+# Last gather_info() result, reused by non-interactive callers for GATHER_CACHE_TTL seconds
+GATHER_CACHE_FILE = CONFIG_DIR / "gather_cache.json"
+GATHER_CACHE_TTL = 300
+CPUINFO_MODEL_RE = re.compile(rb'^model name[ \t]*:(.*)$', re.M)
+CPUINFO_FLAGS_RE = re.compile(rb'^flags[ \t]*:(.*)$', re.M)
+_nvidia_lock = threading.Lock()
+# PCI devices in sysfs; display controllers are class 0x0300xx (VGA) and 0x0302xx (3D)
+PCI_DEVICES_DIR = '/sys/bus/pci/devices'
+PCI_GPU_CLASSES = ('0x0300', '0x0302')
+PCI_GPU_VENDORS = {'0x10de': 'NVIDIA', '0x1002': 'AMD/ATI', '0x8086': 'Intel'}
 
 
 def get_cpu_info():
     """Gather CPU model, architecture, flags, and interpret capabilities for GROMACS optimizations."""
+    import platform
     info = {}
     # Architecture
     info['machine'] = platform.machine()
     info['processor'] = platform.processor()
-    # /proc/cpuinfo parsing
-    flags = []
+    key = _cpuinfo_cache_key(info['machine'])
+    cached = _load_cpuinfo_cache(key)
+    if cached is not None:
+        info.update(cached)
+        return info
+    cpu = {}
+    model_name, flags = _read_cpuinfo()
+    if model_name:
+        cpu['model_name'] = model_name
+    if flags:
+        cpu['flags'] = list(flags)
+        # Interpret CPU flags for GROMACS
+        cpu['capabilities'] = interpret_cpu_flags(flags)
+    if cpu:
+        _save_cpuinfo_cache(key, cpu)
+    info.update(cpu)
+    return info
+
+
+def _slurp(path, size=65536):
+    """Read up to size bytes with a single os.read on a raw fd (no Python file object or buffer)."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=1)
+def _read_cpuinfo():
+    """Return (model_name, flags) of the first processor listed in /proc/cpuinfo."""
+    # procfs files are read in one go (fewer syscalls, no torn reads); the first
+    # match of each anchored pattern belongs to the first processor entry
+    model_name = None
+    flags = ()
     try:
-        with open('/proc/cpuinfo') as f:
-            model_name = None
-            for line in f:
-                if line.startswith('model name') and model_name is None:
-                    model_name = line.split(':', 1)[1].strip()
-                if line.startswith('flags') and not flags:
-                    flags = line.split(':', 1)[1].strip().split()
-                if model_name and flags:
-                    break
-            if model_name:
-                info['model_name'] = model_name
-            if flags:
-                info['flags'] = flags
+        # 64 KiB always covers the first processor entry, which is all we parse
+        data = _slurp('/proc/cpuinfo')
+        m = CPUINFO_MODEL_RE.search(data)
+        if m:
+            model_name = m.group(1).decode(errors='replace').strip() or None
+        m = CPUINFO_FLAGS_RE.search(data)
+        if m:
+            flags = tuple(m.group(1).decode(errors='replace').split())
     except Exception:
         pass
-    # Interpret CPU flags for GROMACS
-    if flags:
-        info['capabilities'] = interpret_cpu_flags(flags)
-    return info
+    return model_name, flags
+
+
+def _cpuinfo_cache_key(machine):
+    """Identify the boot the cached cpuinfo belongs to: host, boot id, kernel release and machine.
+    The host and boot id keep a shared home directory or a reboot onto new hardware from reusing it."""
+    import platform
+    import socket
+    try:
+        boot_id = _slurp(BOOT_ID_FILE, 64).decode(errors='replace').strip()
+    except OSError:
+        boot_id = None
+    return {'host': socket.gethostname(), 'boot_id': boot_id, 'kernel': platform.release(), 'machine': machine}
+
+
+def _load_cpuinfo_cache(key):
+    """Return cached cpuinfo fields if they were recorded under the same cache key."""
+    try:
+        with open(CPUINFO_FILE) as f:
+            cache = json.load(f)
+    except Exception:
+        return None
+    if cache.get('key') == key:
+        return cache.get('cpu')
+    return None
+
+
+def _save_cpuinfo_cache(key, cpu):
+    """Store parsed cpuinfo fields with the cache key they were read under."""
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _write_atomic(CPUINFO_FILE, json.dumps({'key': key, 'cpu': cpu}).encode())
+    except Exception:
+        pass
+
+
+CPU_FLAG_DESCRIPTIONS = {
+    'sse4_1': 'SSE4.1: Basic SIMD instructions, minimal speedup for GROMACS.',
+    'sse4_2': 'SSE4.2: Improved string and CRC instructions; minor benefit.',
+    'avx': 'AVX: 256-bit SIMD; good speedup if GROMACS built with AVX support.',
+    'avx2': 'AVX2: Enhanced 256-bit SIMD integer operations; significant speedup.',
+    'avx512f': 'AVX-512: 512-bit SIMD; highest speedup if available and supported by build.',
+    'fma': 'FMA: Fused Multiply-Add; important for optimized math routines.',
+    'bmi1': 'BMI1: Bit Manipulation Instruction Set 1; may help certain operations.',
+    'bmi2': 'BMI2: Bit Manipulation Instruction Set 2.',
+}
+CPU_FLAG_KEYS = frozenset(CPU_FLAG_DESCRIPTIONS)
 
 
 def interpret_cpu_flags(flags):
     """Interpret CPU flags to determine SIMD capabilities and recommendations for GROMACS."""
+    # only the flags we describe matter, so the memoized key stays small
+    return _interpret_flag_set(tuple(sorted(CPU_FLAG_KEYS.intersection(flags))))
+
+
+@functools.lru_cache(maxsize=8)
+def _interpret_flag_set(known_flags):
+    """Build the capabilities dict for a sorted tuple of known flags (shared; do not mutate)."""
     caps = {}
-    flag_set = set(flags)
-    descriptions = {
-        'sse4_1': 'SSE4.1: Basic SIMD instructions, minimal speedup for GROMACS.',
-        'sse4_2': 'SSE4.2: Improved string and CRC instructions; minor benefit.',
-        'avx': 'AVX: 256-bit SIMD; good speedup if GROMACS built with AVX support.',
-        'avx2': 'AVX2: Enhanced 256-bit SIMD integer operations; significant speedup.',
-        'avx512f': 'AVX-512: 512-bit SIMD; highest speedup if available and supported by build.',
-        'fma': 'FMA: Fused Multiply-Add; important for optimized math routines.',
-        'bmi1': 'BMI1: Bit Manipulation Instruction Set 1; may help certain operations.',
-        'bmi2': 'BMI2: Bit Manipulation Instruction Set 2.',
-    }
-    supported = [flag for flag in descriptions if flag in flag_set]
+    flag_set = frozenset(known_flags)
+    supported = [flag for flag in CPU_FLAG_DESCRIPTIONS if flag in flag_set]
     caps['supported_flags'] = supported
     # Determine highest SIMD level
     simd_levels = []
-    if 'avx512f' in flag_set and 'fma' in flag_set:
+    if flag_set.issuperset(('avx512f', 'fma')):
         simd_levels.append('AVX512')
-    if 'avx2' in flag_set and 'fma' in flag_set:
+    if flag_set.issuperset(('avx2', 'fma')):
         simd_levels.append('AVX2')
     if 'avx' in flag_set:
         simd_levels.append('AVX')
@@ -83,7 +176,7 @@ def interpret_cpu_flags(flags):
         caps['recommended_cpu_build'] = 'GROMACS build with SSE4.1 support'
     else:
         caps['recommended_cpu_build'] = 'No advanced SIMD detected; use generic build or consider upgrading CPU for performance.'
-    caps['descriptions'] = {flag: descriptions.get(flag, '') for flag in supported}
+    caps['descriptions'] = {flag: CPU_FLAG_DESCRIPTIONS[flag] for flag in supported}
     return caps
 
 
@@ -91,13 +184,10 @@ def get_memory_info():
     """Gather total RAM in KB."""
     info = {}
     try:
-        with open('/proc/meminfo') as f:
-            for line in f:
-                if line.startswith('MemTotal'):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        info['MemTotal_kB'] = int(parts[1])
-                    break
+        data = _slurp('/proc/meminfo')
+        m = re.search(rb'^MemTotal:\s+(\d+)', data, re.M)
+        if m:
+            info['MemTotal_kB'] = int(m.group(1))
     except Exception:
         pass
     return info
@@ -105,99 +195,217 @@ def get_memory_info():
 
 def get_os_info():
     """Gather Linux distribution info from /etc/os-release."""
+    import platform
     info = {}
     try:
-        with open('/etc/os-release') as f:
-            for line in f:
-                if '=' in line:
-                    k, v = line.strip().split('=', 1)
-                    v = v.strip().strip('"')
-                    if k in ('NAME', 'VERSION', 'ID', 'VERSION_ID'):
-                        info[k] = v
+        data = _slurp('/etc/os-release').decode(errors='replace')
+        for line in data.splitlines():
+            if '=' in line:
+                k, v = line.strip().split('=', 1)
+                v = v.strip().strip('"')
+                if k in ('NAME', 'VERSION', 'ID', 'VERSION_ID'):
+                    info[k] = v
     except Exception:
         pass
     info['kernel'] = platform.release()
     return info
 
 
+def _can_prompt(interactive=True):
+    """True if we may block on input(): interactive use with a terminal on stdin."""
+    try:
+        return interactive and sys.stdin is not None and sys.stdin.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
 def _run_command(cmd):
-    """Run a command and return (stdout, stderr), or (None, None) if fails."""
+    """Run a command and return raw (stdout, stderr) bytes, or (None, None) if fails."""
+    import subprocess
     try:
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
         return result.stdout.strip(), result.stderr.strip()
     except Exception:
         return None, None
 
 
+@functools.lru_cache(maxsize=1)
+def _query_nvidia_smi():
+    """Query GPU names and driver with one nvidia-smi CSV call; return {'gpus', 'driver', 'cuda_version'} or None.
+    The CSV query has no CUDA field, so cuda_version is None; only NVML reports it."""
+    import shutil
+    if not shutil.which('nvidia-smi'):
+        return None
+    out, _ = _run_command(['nvidia-smi', '--query-gpu=name,driver_version', '--format=csv,noheader'])
+    if not out:
+        return None
+    names = []
+    driver = None
+    for line in out.decode(errors='replace').splitlines():
+        parts = [p.strip() for p in line.split(',')]
+        if len(parts) >= 2:
+            names.append(parts[0])
+            driver = parts[1]
+    return {'gpus': names, 'driver': driver, 'cuda_version': None}
+
+
+def _nvml_str(value):
+    """NVML returns bytes in older pynvml releases and str in newer ones."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+@functools.lru_cache(maxsize=1)
+def _query_nvml():
+    """Same snapshot as _query_nvidia_smi, read through NVML; None if NVML is unusable.
+    pynvml is imported here so only GPU probing pays for it; nvidia-smi is used when it is missing."""
+    try:
+        import pynvml
+    except ImportError:
+        return None
+    try:
+        pynvml.nvmlInit()
+    except Exception:
+        return None
+    try:
+        names = []
+        for i in range(pynvml.nvmlDeviceGetCount()):
+            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+            names.append(_nvml_str(pynvml.nvmlDeviceGetName(handle)))
+        driver = _nvml_str(pynvml.nvmlSystemGetDriverVersion())
+        try:
+            cuda = pynvml.nvmlSystemGetCudaDriverVersion_v2()
+            cuda_version = f"{cuda // 1000}.{cuda % 1000 // 10}"
+        except Exception:
+            cuda_version = None
+        return {'gpus': names, 'driver': driver, 'cuda_version': cuda_version}
+    except Exception:
+        return None
+    finally:
+        try:
+            pynvml.nvmlShutdown()
+        except Exception:
+            pass
+
+
+def nvidia_snapshot():
+    """Shared NVIDIA driver snapshot; the GPU and CUDA probes may ask for it concurrently."""
+    with _nvidia_lock:
+        return _query_nvml() or _query_nvidia_smi()
+
+
+def nvidia_cuda_version():
+    """Highest CUDA version the NVIDIA driver supports, as reported by NVML; None otherwise.
+    Never runs nvidia-smi a second time just for the banner."""
+    nvidia = nvidia_snapshot()
+    if not nvidia or not nvidia['driver']:
+        return None
+    return nvidia['cuda_version']
+
+
 def get_gpu_info():
-    """Detect GPUs: NVIDIA, AMD, Intel. Check availability via nvidia-smi, rocminfo, lspci fallback."""
+    """Detect GPUs: NVIDIA, AMD, Intel. Check availability via NVML/nvidia-smi, rocminfo, sysfs PCI fallback."""
+    import shutil
     gpus = []
     # NVIDIA detection
-    out, _ = _run_command(['which', 'nvidia-smi'])
-    if out:
-        out2, _ = _run_command(['nvidia-smi', '--query-gpu=name,driver_version', '--format=csv,noheader'])
-        if out2:
-            for line in out2.splitlines():
-                parts = [p.strip() for p in line.split(',')]
-                if len(parts) >= 2:
-                    gpus.append({'vendor': 'NVIDIA', 'name': parts[0], 'driver': parts[1]})
+    nvidia = nvidia_snapshot()
+    if nvidia and nvidia['driver']:
+        for name in nvidia['gpus']:
+            gpus.append({'vendor': 'NVIDIA', 'name': name, 'driver': nvidia['driver']})
     # AMD detection via ROCm tools
-    out, _ = _run_command(['which', 'rocminfo'])
+    out = shutil.which('rocminfo')
     if out:
         out2, _ = _run_command(['rocminfo'])
         names = []
         if out2:
             for line in out2.splitlines():
-                if 'Agent' in line and 'gfx' in line:
-                    names.append(line.strip())
+                if b'Agent' in line and b'gfx' in line:
+                    names.append(line.strip().decode(errors='replace'))
         if names:
             gpus.append({'vendor': 'AMD ROCm', 'details': names})
     else:
-        out, _ = _run_command(['which', 'rocm-smi'])
+        out = shutil.which('rocm-smi')
         if out:
             out2, _ = _run_command(['rocm-smi', '-i'])
-            details = out2.splitlines() if out2 else []
+            details = out2.decode(errors='replace').splitlines() if out2 else []
             gpus.append({'vendor': 'AMD ROCm', 'details': details})
-    # Fallback: parse lspci for GPU entries
-    out, _ = _run_command(['which', 'lspci'])
-    if out:
-        out2, _ = _run_command(['lspci'])
-        if out2:
-            for line in out2.splitlines():
-                low = line.lower()
-                if 'vga compatible controller' in low or '3d controller' in low:
-                    if 'nvidia' in low:
-                        continue
-                    elif 'amd' in low or 'advanced micro devices' in low or 'radeon' in low:
-                        gpus.append({'vendor': 'AMD/ATI', 'description': line.split(':', 1)[1].strip()})
-                    elif 'intel' in low:
-                        gpus.append({'vendor': 'Intel', 'description': line.split(':', 1)[1].strip()})
+    # Fallback: PCI display controllers from sysfs (NVIDIA is covered above)
+    gpus.extend(_scan_pci_gpus())
+    return gpus
+
+
+def _read_sysfs(path):
+    """Return the stripped contents of a small sysfs attribute file, or None."""
+    try:
+        return _slurp(path, 4096).decode(errors='replace').strip()
+    except OSError:
+        return None
+
+
+def _scan_pci_gpus():
+    """List non-NVIDIA AMD/Intel display controllers from sysfs PCI class/vendor/device files."""
+    gpus = []
+    try:
+        devices = sorted(os.scandir(PCI_DEVICES_DIR), key=lambda d: d.name)
+    except OSError:
+        return gpus
+    for dev in devices:
+        cls = _read_sysfs(os.path.join(dev.path, 'class'))
+        if not cls or not cls.startswith(PCI_GPU_CLASSES):
+            continue
+        vendor_id = _read_sysfs(os.path.join(dev.path, 'vendor'))
+        vendor = PCI_GPU_VENDORS.get(vendor_id)
+        if vendor is None or vendor == 'NVIDIA':
+            continue
+        device_id = _read_sysfs(os.path.join(dev.path, 'device')) or '0x????'
+        gpus.append({'vendor': vendor, 'pci_slot': dev.name, 'pci_id': f"{vendor_id[2:]}:{device_id[2:]}"})
     return gpus
 
 
 def get_cuda_info():
     """Check for CUDA Toolkit installation via nvcc."""
+    import shutil
     info = {'installed': False}
     nvcc_path = shutil.which('nvcc')
+    if not nvcc_path and os.path.exists('/usr/local/cuda/bin/nvcc'):
+        nvcc_path = '/usr/local/cuda/bin/nvcc'
     if nvcc_path:
         info['installed'] = True
-        out, _ = _run_command(['nvcc', '--version'])
-        if out:
-            info['version_info'] = out.splitlines()[-1].strip()
-    else:
-        cuda_path = Path('/usr/local/cuda/bin/nvcc')
-        if cuda_path.exists():
-            info['installed'] = True
-            out, _ = _run_command([str(cuda_path), '--version'])
-            if out:
-                info['version_info'] = out.splitlines()[-1].strip()
+        version = _cuda_toolkit_version(nvcc_path)
+        if version:
+            info['version_info'] = version
+    # Highest CUDA version the installed driver supports (only known when NVML is available)
+    driver_cuda = nvidia_cuda_version()
+    if driver_cuda:
+        info['driver_cuda_version'] = driver_cuda
     return info
 
 
+def _cuda_toolkit_version(nvcc_path):
+    """Read the toolkit version from version.json/version.txt next to nvcc's bin dir; run nvcc only if absent."""
+    root = Path(nvcc_path).resolve().parent.parent
+    try:
+        with open(root / 'version.json', 'rb') as f:
+            return f"CUDA Version {json.loads(f.read())['cuda']['version']}"
+    except Exception:
+        pass
+    try:
+        with open(root / 'version.txt') as f:
+            line = f.readline().strip()
+        if line:
+            return line
+    except OSError:
+        pass
+    out, _ = _run_command([nvcc_path, '--version'])
+    if out:
+        return out.splitlines()[-1].strip().decode(errors='replace')
+    return None
+
+
 def check_gromacs_setup(interactive=True):
     """Check GROMACS availability: whether 'gmx' is in PATH or install exists but not sourced.
-    If interactive, can attempt sourcing GMXRC scripts and prompt user to make permanent.
+    If interactive (and stdin is a terminal), can attempt sourcing GMXRC scripts and prompt user to make permanent.
     After sourcing, update PATH in current process for immediate detection."""
+    import shutil
     info = {'gmx_in_path': False, 'possible_install_paths': [], 'gmrc_scripts': []}
     gmx_path = shutil.which('gmx')
     if gmx_path:
@@ -214,12 +422,13 @@ def check_gromacs_setup(interactive=True):
     for rc in common_rc:
         if rc.exists():
             info['gmrc_scripts'].append(str(rc))
-    # If interactive and GMXRC scripts found, test sourcing
-    if interactive and info['gmrc_scripts']:
+    # If interactive and GMXRC scripts found, test sourcing; without a TTY only record the scripts
+    if _can_prompt(interactive) and info['gmrc_scripts']:
         for rc in info['gmrc_scripts']:
             cmd = ['bash', '-c', f'source {rc} >/dev/null 2>&1 && command -v gmx']
             out, _ = _run_command(cmd)
             if out:
+                out = out.decode(errors='replace')
                 print(f"Found GMXRC script at {rc}. After sourcing, 'gmx' is available at: {out}")
                 resp = input("Do you want to add this source line to your shell rc for permanent access? [Y/n]: ").strip().lower()
                 if resp == '' or resp.startswith('y'):
@@ -255,34 +464,105 @@ def add_source_to_shell(rc_path):
         print(f"Failed to append to {rc_file}: {e}")
 
 
+def _scan_path_once():
+    """Map each PATH directory to its set of file names (None if it does not exist)."""
+    return _scan_path_dirs(os.environ.get('PATH', ''))
+
+
+@functools.lru_cache(maxsize=4)
+def _scan_path_dirs(path_env):
+    """One listdir per distinct PATH entry; a failed listing doubles as the existence check."""
+    listing = {}
+    for p in path_env.split(os.pathsep):
+        if p in listing:
+            continue
+        try:
+            listing[p] = frozenset(os.listdir(p))
+        except PermissionError:
+            listing[p] = frozenset()
+        except OSError:
+            listing[p] = None
+    return listing
+
+
 def get_path_info():
     """Gather PATH entries and check existence."""
-    paths = os.environ.get('PATH', '').split(os.pathsep)
-    info = []
-    for p in paths:
-        exists = os.path.isdir(p)
-        info.append({'path': p, 'exists': exists})
-    return info
+    listing = _scan_path_once()
+    return [{'path': p, 'exists': listing[p] is not None} for p in os.environ.get('PATH', '').split(os.pathsep)]
 
 
 def check_executables(executables):
     """Check if executables are in PATH."""
+    # the cached listings only prefilter; a hit must be a file we can execute, as with shutil.which
+    listing = _scan_path_once()
     found = {}
     for exe in executables:
-        path = shutil.which(exe)
-        found[exe] = bool(path)
+        found[exe] = any(
+            names and exe in names and os.path.isfile(os.path.join(d, exe)) and os.access(os.path.join(d, exe), os.X_OK)
+            for d, names in listing.items())
     return found
 
 
-def gather_info(interactive=True):
-    """Gather all system info into a dict, including recommendations."""
+def _gather_cache_key(interactive):
+    """Identify the environment a gather_info() result depends on: kernel, PATH and prompting."""
+    import platform
+    path = os.environ.get('PATH', '')
+    return {
+        'kernel': platform.release(),
+        'path': hashlib.blake2b(path.encode(errors='surrogateescape'), digest_size=16).hexdigest(),
+        'interactive': bool(interactive),
+    }
+
+
+def _load_gather_cache(interactive=False):
+    """Return the cached gather_info() result if it is fresh and was gathered in the same environment."""
+    try:
+        with open(GATHER_CACHE_FILE, 'rb') as f:
+            data = f.read()
+        cache = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    except Exception:
+        return None
+    if time.time() - cache.get('timestamp', 0) >= cache.get('ttl', GATHER_CACHE_TTL):
+        return None
+    if cache.get('key') != _gather_cache_key(interactive):
+        return None
+    return cache.get('data')
+
+
+def _save_gather_cache(info, interactive=False):
+    """Store a gather_info() result with its timestamp, TTL and environment key."""
+    cache = {'timestamp': time.time(), 'ttl': GATHER_CACHE_TTL, 'key': _gather_cache_key(interactive), 'data': info}
+    try:
+        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        data = orjson.dumps(cache) if ORJSON_AVAILABLE else json.dumps(cache).encode()
+        _write_atomic(GATHER_CACHE_FILE, data)
+    except Exception:
+        pass
+
+
+def gather_info(interactive=True, use_cache=None):
+    """Gather all system info into a dict, including recommendations.
+    By default non-interactive calls reuse a result gathered in the last GATHER_CACHE_TTL seconds
+    under the same kernel and PATH; only those cached calls write the cache."""
+    from concurrent.futures import ThreadPoolExecutor
+    if use_cache is None:
+        use_cache = not interactive
+    if use_cache:
+        cached = _load_gather_cache(interactive)
+        if cached is not None:
+            return cached
     info = {}
-    info['cpu'] = get_cpu_info()
-    info['memory'] = get_memory_info()
-    info['os'] = get_os_info()
-    info['gpus'] = get_gpu_info()
-    info['cuda'] = get_cuda_info()
-    info['gromacs'] = check_gromacs_setup(interactive=interactive)
+    # The probes are independent and mostly wait on files/subprocesses, so run them concurrently.
+    # The GROMACS check stays on this thread because it may prompt the user.
+    probes = {'cpu': get_cpu_info, 'memory': get_memory_info, 'os': get_os_info,
+              'gpus': get_gpu_info, 'cuda': get_cuda_info}
+    with ThreadPoolExecutor(max_workers=len(probes)) as ex:
+        futures = {key: ex.submit(fn) for key, fn in probes.items()}
+        gromacs = check_gromacs_setup(interactive=interactive)
+        for key, fut in futures.items():
+            info[key] = fut.result()
+    info['gromacs'] = gromacs
+    # both share one (cached) PATH scan, taken after the GROMACS check may have extended PATH
     info['path_entries'] = get_path_info()
     executables = ['gmx', 'python3', 'pip3', 'lspci', 'nvcc', 'rocminfo', 'rocm-smi']
     executables_status = check_executables(executables)
@@ -303,9 +583,8 @@ def gather_info(interactive=True):
         if gpu.get('vendor') == 'NVIDIA' and cuda.get('installed'):
             gpu_recs.append('GROMACS with CUDA GPU support')
         elif gpu.get('vendor') in ('AMD ROCm', 'AMD/ATI'):
-            # Could check ROCm availability
-            # If rocm detected?
-            if shutil.which('rocminfo') or shutil.which('rocm-smi'):
+            # ROCm tools were already looked up with the other executables
+            if executables_status.get('rocminfo') or executables_status.get('rocm-smi'):
                 gpu_recs.append('GROMACS with ROCm GPU support')
     if gpu_recs:
         rec['gpu'] = gpu_recs
@@ -316,6 +595,8 @@ def gather_info(interactive=True):
     except Exception:
         writable = False
     info['config_dir'] = {'path': str(CONFIG_DIR), 'writable': writable}
+    if use_cache:
+        _save_gather_cache(info, interactive)
     return info
 
 
@@ -323,19 +604,39 @@ def load_previous_info():
     """Load previous info from INFO_FILE, or return None if not exists."""
     if INFO_FILE.exists():
         try:
-            with open(INFO_FILE) as f:
-                return json.load(f)
+            with open(INFO_FILE, 'rb') as f:
+                data = f.read()
+            return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
         except Exception:
             return None
     return None
 
 
+def info_digest(info):
+    """Stable blake2b digest of an info dict, ignoring any stored 'digest' entry."""
+    content = {k: v for k, v in info.items() if k != 'digest'}
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(content, option=orjson.OPT_SORT_KEYS)
+    else:
+        data = json.dumps(content, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _gpu_key(g):
+    """Sortable (vendor, name, details) identity of a GPU entry; every field has a fixed type."""
+    name = g.get('name') or g.get('description') or g.get('pci_slot') or ''
+    return (g.get('vendor') or '', name, tuple(g.get('details') or ()))
+
+
 def compare_info(prev, curr):
     """Compare two info dicts. Return dict of changes."""
     changes = {}
     if not prev:
         changes['initial_run'] = True
         return changes
+    # Unchanged machines produce identical info; skip the field-by-field diff
+    if (prev.get('digest') or info_digest(prev)) == info_digest(curr):
+        return changes
     # Compare CPU model
     prev_cpu = prev.get('cpu', {})
     curr_cpu = curr.get('cpu', {})
@@ -345,14 +646,10 @@ def compare_info(prev, curr):
     if prev.get('memory', {}).get('MemTotal_kB') != curr.get('memory', {}).get('MemTotal_kB'):
         changes['memory_changed'] = {'old': prev.get('memory', {}).get('MemTotal_kB'), 'new': curr.get('memory', {}).get('MemTotal_kB')}
     # Compare GPU list by vendor and identifier
-    def gpu_identifier(g):
-        vendor = g.get('vendor')
-        name = g.get('name') or g.get('description') or (','.join(g.get('details')) if g.get('details') else None)
-        return (vendor, name)
-    prev_gpus = {gpu_identifier(g) for g in prev.get('gpus', [])}
-    curr_gpus = {gpu_identifier(g) for g in curr.get('gpus', [])}
+    prev_gpus = sorted(map(_gpu_key, prev.get('gpus', [])))
+    curr_gpus = sorted(map(_gpu_key, curr.get('gpus', [])))
     if prev_gpus != curr_gpus:
-        changes['gpus_changed'] = {'old': list(prev_gpus), 'new': list(curr_gpus)}
+        changes['gpus_changed'] = {'old': prev_gpus, 'new': curr_gpus}
     # Compare CUDA installation
     prev_cuda = prev.get('cuda', {})
     curr_cuda = curr.get('cuda', {})
@@ -391,8 +688,9 @@ def compare_info(prev, curr):
     return changes
 
 
-def prompt_user_for_changes(changes):
-    """Prompt user about detected changes. Returns True if user wants to update stored info."""
+def prompt_user_for_changes(changes, interactive=True):
+    """Prompt user about detected changes. Returns True if user wants to update stored info.
+    Without a terminal to prompt on, stored info is left unchanged."""
     if not changes:
         print("No changes detected in system configuration.")
         return False
@@ -402,16 +700,39 @@ def prompt_user_for_changes(changes):
     print("Detected changes in system configuration:")
     for key, val in changes.items():
         print(f"- {key}: {val}")
+    if not _can_prompt(interactive):
+        print("No terminal to confirm on; not updating stored system info.")
+        return False
     resp = input("Do you want to update stored system info? [Y/n]: ").strip().lower()
     return (resp == '' or resp.startswith('y'))
 
 
+def _write_atomic(path, data):
+    """Write bytes to a temp file beside path and rename it over path, so readers never see a partial file."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def save_info(info):
     """Save current info to INFO_FILE."""
     try:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        with open(INFO_FILE, 'w') as f:
-            json.dump(info, f, indent=2)
+        # store the digest so the next compare_info need not recompute it for prev
+        info = dict(info, digest=info_digest(info))
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(info, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(info, indent=2).encode()
+        _write_atomic(INFO_FILE, data)
         print(f"System info saved to {INFO_FILE}")
     except Exception as e:
         print(f"Failed to save system info: {e}")
@@ -419,10 +740,10 @@ def save_info(info):
 
 def main():
     interactive = True
-    curr = gather_info(interactive=interactive)
+    curr = gather_info(interactive=interactive, use_cache=False)
     prev = load_previous_info()
     changes = compare_info(prev, curr)
-    if prompt_user_for_changes(changes):
+    if prompt_user_for_changes(changes, interactive=interactive):
         save_info(curr)
     else:
         print("Stored system info left unchanged.")
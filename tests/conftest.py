@@ -0,0 +1,50 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# the modules are imported the same way bpcss.py does, from the modules directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'modules'))
+
+
+def _coord(serial, name, resname, chain, resseq, icode=' ', het=False):
+    record = 'HETATM' if het else 'ATOM  '
+    return (f"{record}{serial:5d} {name:<4} {resname:>3} {chain}{resseq:4d}{icode}   "
+            f"{1.0 + serial:8.3f}{2.0:8.3f}{3.0:8.3f}{1.0:6.2f}{0.0:6.2f}          {name.strip()[0]:>2}")
+
+
+def _seqres(chain, names):
+    return f"SEQRES   1 {chain} {len(names):4d}  " + " ".join(names)
+
+
+def _fixture_lines():
+    # chain A: insertion code (3A), a numbering gap and a short TER; chain B starts at 5;
+    # the second model has a different layout and must not affect the first-model scan
+    residues = [('A', 1, ' ', 'GLY'), ('A', 2, ' ', 'ALA'), ('A', 3, ' ', 'SER'),
+                ('A', 3, 'A', 'THR'), ('A', 6, ' ', 'VAL'),
+                ('B', 5, ' ', 'GLY'), ('B', 6, ' ', 'GLY'), ('B', 7, ' ', 'GLY')]
+    lines = [_seqres('A', ['GLY', 'ALA', 'SER', 'THR', 'VAL', 'LEU']), _seqres('B', ['GLY'] * 3), "MODEL        1"]
+    serial = 1
+    for i, (chain, resseq, icode, resname) in enumerate(residues):
+        for name in (' N', ' CA'):
+            lines.append(_coord(serial, name, resname, chain, resseq, icode)); serial += 1
+        if i + 1 == len(residues) or residues[i + 1][0] != chain:
+            lines.append(f"TER   {serial:5d}      {resname} {chain}{resseq:4d}"); serial += 1
+            if chain == 'A':
+                lines.append(_coord(serial, ' C1', 'NAG', 'A', 101, het=True)); serial += 1
+                lines.append(_coord(serial, ' O', 'HOH', 'A', 201, het=True)); serial += 1
+    lines.append(_coord(serial, ' O', 'HOH', 'B', 301, het=True)); serial += 1
+    lines += ["ENDMDL", "MODEL        2"]
+    for resseq, resname in ((1, 'GLY'), (2, 'ALA')):
+        lines.append(_coord(serial, ' CA', resname, 'A', resseq)); serial += 1
+    lines.append(_coord(serial, ' CA', 'TRP', 'C', 40)); serial += 1
+    lines += ["ENDMDL", "END"]
+    return lines
+
+
+@pytest.fixture(params=['lf', 'crlf'])
+def fixture_pdb(request, tmp_path):
+    eol = '\r\n' if request.param == 'crlf' else '\n'
+    path = tmp_path / f"fixture_{request.param}.pdb"
+    path.write_bytes((eol.join(_fixture_lines()) + eol).encode())
+    return path
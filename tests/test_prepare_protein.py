@@ -0,0 +1,107 @@
+from Bio.PDB import PDBParser
+from Bio.PDB.Chain import Chain
+from Bio.PDB.Model import Model
+from Bio.PDB.Residue import Residue
+from Bio.PDB.Structure import Structure
+
+import prepare_protein as pp
+
+
+ATOM_LINES = [
+    b"ATOM      1  N   GLY A  10      11.104   6.134  -6.504  1.00  0.00           N",
+    b"ATOM      2  CA  GLY A  11      11.639   6.071  -5.147  1.00  0.00           C",
+]
+
+
+def test_renumber_short_ter_line(tmp_path):
+    src = tmp_path / 'in.pdb'
+    out = tmp_path / 'out.pdb'
+    # OpenMM/PDBFixer style TER: 26 columns, no insertion-code column
+    src.write_bytes(b"\n".join(ATOM_LINES) + b"\nTER       3      GLY A  11\nEND\n")
+    pp.renumber_pdb_text(src, out)
+    lines = out.read_bytes().split(b"\n")
+    assert lines[0][22:26] == b"   1"
+    assert lines[1][22:26] == b"   2"
+    assert lines[2] == b"TER       3      GLY A   2"
+    assert lines[3] == b"END"
+
+
+def test_renumber_keeps_crlf(tmp_path):
+    src = tmp_path / 'in.pdb'
+    out = tmp_path / 'out.pdb'
+    src.write_bytes(b"\r\n".join(ATOM_LINES) + b"\r\nTER       3      GLY A  11\r\nEND\r\n")
+    pp.renumber_pdb_text(src, out)
+    lines = out.read_bytes().split(b"\r\n")
+    assert [l[22:26] for l in lines[:2]] == [b"   1", b"   2"]
+    assert lines[2] == b"TER       3      GLY A   2"
+    assert lines[3:] == [b"END", b""]
+    assert b"\n" not in b"".join(lines)
+
+
+def test_renumber_pdb_text_matches_bio(fixture_pdb, tmp_path):
+    out = tmp_path / 'renumbered.pdb'
+    pp.renumber_pdb_text(fixture_pdb, out, start=1)
+    before = PDBParser(QUIET=True).get_structure('in', str(fixture_pdb))
+    after = PDBParser(QUIET=True).get_structure('out', str(out))
+    assert [m.id for m in after] == [m.id for m in before]
+    for model_in, model_out in zip(before, after):
+        assert [c.id for c in model_out] == [c.id for c in model_in]
+        for chain_in, chain_out in zip(model_in, model_out):
+            # what Bio.PDB renumbering yields: sequential ids per chain, blank icodes, same residues
+            expected = [((r.id[0], i, ' '), r.get_resname(), len(r)) for i, r in enumerate(chain_in, 1)]
+            assert [(r.id, r.get_resname(), len(r)) for r in chain_out] == expected
+    # line terminators and non-residue records pass through unchanged
+    src_lines = fixture_pdb.read_bytes().splitlines(keepends=True)
+    out_lines = out.read_bytes().splitlines(keepends=True)
+    assert len(out_lines) == len(src_lines)
+    for a, b in zip(src_lines, out_lines):
+        assert len(a) == len(b) and a[len(a.rstrip(b"\r\n")):] == b[len(b.rstrip(b"\r\n")):]
+        if a[:6] not in pp.RESIDUE_RECORDS:
+            assert a == b
+
+
+def _structure(chains):
+    # chains: {chain id: [resname, ...]}; 'HOH' entries become water residues
+    structure = Structure('s')
+    model = Model(0)
+    structure.add(model)
+    for cid, names in chains.items():
+        chain = Chain(cid)
+        model.add(chain)
+        for i, name in enumerate(names, 1):
+            chain.add(Residue(('W' if name == 'HOH' else ' ', i, ' '), name, ' '))
+    return structure
+
+
+def _greedy_missing(seqres, observed):
+    # the in-order matching detect_missing_residues used before the difflib alignment
+    miss = []
+    i = j = 0
+    while i < len(seqres) and j < len(observed):
+        if seqres[i] == observed[j]:
+            i += 1; j += 1
+        else:
+            miss.append((i + 1, seqres[i])); i += 1
+    miss.extend((k + 1, seqres[k]) for k in range(i, len(seqres)))
+    return miss
+
+
+def test_detect_missing_residues_gaps_match_greedy():
+    seqres = ['MET', 'GLY', 'ALA', 'SER', 'THR', 'VAL', 'LEU']
+    observed = ['GLY', 'ALA', 'THR', 'VAL', 'HOH']
+    missing = pp.detect_missing_residues({'A': seqres}, _structure({'A': observed}))
+    # pure gaps (the common case) are reported exactly as before; waters are ignored
+    assert missing == {'A': [(1, 'MET'), (4, 'SER'), (7, 'LEU')]}
+    assert missing['A'] == _greedy_missing(seqres, observed[:-1])
+
+
+def test_detect_missing_residues_extra_and_mislabelled():
+    seqres = ['GLY', 'ALA', 'SER', 'THR', 'VAL']
+    missing = pp.detect_missing_residues(
+        {'A': seqres, 'B': seqres, 'C': seqres},
+        _structure({'A': ['GLY', 'ALA', 'UNK', 'SER', 'THR', 'VAL'],
+                    'B': ['GLY', 'ALA', 'CYS', 'THR', 'VAL'],
+                    'C': seqres}))
+    # an extra observed residue no longer marks everything after it as missing,
+    # and a mislabelled one counts only itself
+    assert missing == {'B': [(3, 'SER')]}
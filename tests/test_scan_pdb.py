@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from Bio import SeqIO
+from Bio.PDB import PDBParser
+from Bio.SeqUtils import seq1
+
+import prepare_protein as pp
+
+
+def _bio_model(path):
+    return PDBParser(QUIET=True).get_structure('x', str(path))[0]
+
+
+def test_scan_pdb_matches_bio(fixture_pdb):
+    scan = pp.scan_pdb(fixture_pdb)
+    model = _bio_model(fixture_pdb)
+    polymer = {c.id: [r.id[1] for r in c if r.id[0] == ' '] for c in model}
+    all_resseqs = {c.id: [r.id[1] for r in c] for c in model}
+    hets = {}
+    for chain in model:
+        names = sorted({r.get_resname() for r in chain if r.id[0] != ' '})
+        if names:
+            hets[chain.id] = names
+    assert scan['chains'] == sorted(cid for cid, seqs in polymer.items() if seqs)
+    assert scan['hets'] == hets
+    assert {cid: list(seqs) for cid, seqs in scan['chain_resseqs'].items()} == polymer
+    assert scan['discontinuities'] == pp.detect_numbering_discontinuities(all_resseqs)
+    assert scan['discontinuities'] == {'A': [(3, 3), (3, 6), (6, 101), (101, 201)], 'B': [(7, 301)]}
+    bio_seqres = {rec.annotations['chain']: str(rec.seq) for rec in SeqIO.parse(str(fixture_pdb), 'pdb-seqres')}
+    assert {cid: ''.join(seq1(r) for r in names) for cid, names in scan['seqres'].items()} == bio_seqres
+
+
+def test_line_columns_pads_short_lines():
+    data = b"ATOM\nHETATM  12\nSEQRES   1 A    1  GLY"
+    raw = np.frombuffer(data + b' ' * 80, dtype=np.uint8)
+    starts, ends, kinds = pp._index_records_np(raw, len(data))
+    assert kinds.tolist() == [pp.REC_ATOM, pp.REC_HETATM, pp.REC_SEQRES]
+    rows = pp._line_columns(raw, starts, ends, 12)
+    # columns past a line's end read as blanks, never as the next line's bytes
+    assert [row.tobytes() for row in rows] == [b"ATOM        ", b"HETATM  12  ", b"SEQRES   1 A"]
+
+
+def test_scan_pdb_residue_arrays(fixture_pdb):
+    chain_resseqs = pp.scan_pdb(fixture_pdb)['chain_resseqs']
+    # chains in order of first appearance, numbers as int32 arrays for score_structure
+    assert list(chain_resseqs) == ['A', 'B']
+    assert all(isinstance(v, np.ndarray) and v.dtype == np.int32 for v in chain_resseqs.values())
+    assert chain_resseqs['A'].tolist() == [1, 2, 3, 3, 6]
+
+
+@pytest.mark.skipif(not pp.NUMBA_AVAILABLE, reason="numba not installed")
+@pytest.mark.parametrize('data', [
+    b"",
+    b"ATOM\n",
+    b"SEQRES   1 A    1  GLY\r\nATOM      1  N   GLY A   1\r\nENDMDL\r\nATOM      2\r\n",
+    b"HETATM    1  O   HOH A 201\nTER\nEND",
+])
+def test_index_records_numba_matches_numpy(data):
+    raw = np.frombuffer(data + b' ' * 80, dtype=np.uint8)
+    expected = pp._index_records_np(raw, len(data))
+    got = pp._index_records_nb(raw, len(data))
+    for a, b in zip(got, expected):
+        assert a.tolist() == b.tolist()
+
+
+@pytest.mark.skipif(not pp.NUMBA_AVAILABLE, reason="numba not installed")
+def test_index_records_numba_matches_numpy_on_fixture(fixture_pdb):
+    data = fixture_pdb.read_bytes()
+    raw = np.frombuffer(data + b' ' * 80, dtype=np.uint8)
+    for a, b in zip(pp._index_records_nb(raw, len(data)), pp._index_records_np(raw, len(data))):
+        assert a.tolist() == b.tolist()
@@ -0,0 +1,117 @@
+import os
+import shutil
+
+import system_info as si
+
+
+def test_check_executables_matches_which(tmp_path, monkeypatch):
+    bin_a = tmp_path / 'a'
+    bin_b = tmp_path / 'b'
+    bin_a.mkdir(); bin_b.mkdir()
+    (bin_a / 'tool').write_text('#!/bin/sh\n'); (bin_a / 'tool').chmod(0o755)
+    (bin_a / 'noexec').write_text('data'); (bin_a / 'noexec').chmod(0o644)
+    (bin_a / 'adir').mkdir()
+    (bin_a / 'dangling').symlink_to(tmp_path / 'nowhere')
+    (bin_b / 'linked').symlink_to(bin_a / 'tool')
+    # shadowed: not executable in the first directory, executable in the second
+    (bin_a / 'shadow').write_text('data'); (bin_a / 'shadow').chmod(0o644)
+    (bin_b / 'shadow').write_text('#!/bin/sh\n'); (bin_b / 'shadow').chmod(0o755)
+    path = os.pathsep.join([str(bin_a), str(tmp_path / 'missing'), str(bin_b)])
+    monkeypatch.setenv('PATH', path)
+    names = ['tool', 'noexec', 'adir', 'dangling', 'linked', 'shadow', 'absent']
+    found = si.check_executables(names)
+    assert found == {name: shutil.which(name, path=path) is not None for name in names}
+    assert found == {'tool': True, 'noexec': False, 'adir': False, 'dangling': False,
+                     'linked': True, 'shadow': True, 'absent': False}
+
+
+def test_get_path_info_marks_missing_dirs(tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', os.pathsep.join([str(tmp_path), str(tmp_path / 'missing')]))
+    assert si.get_path_info() == [{'path': str(tmp_path), 'exists': True},
+                                  {'path': str(tmp_path / 'missing'), 'exists': False}]
+
+
+INFO = {
+    'cpu': {'model_name': 'Test CPU', 'flags': ['avx2', 'fma']},
+    'memory': {'MemTotal_kB': 16384},
+    'gpus': [{'vendor': 'NVIDIA', 'name': 'Tesla T4', 'driver': '535'}],
+    'os': {'NAME': 'Linux', 'VERSION_ID': '1', 'kernel': '6.1'},
+}
+
+
+def test_info_digest_ignores_key_order_and_stored_digest():
+    reordered = dict(reversed(list(INFO.items())))
+    assert si.info_digest(reordered) == si.info_digest(INFO)
+    assert si.info_digest(dict(INFO, digest='stale')) == si.info_digest(INFO)
+    assert si.info_digest(dict(INFO, memory={'MemTotal_kB': 8192})) != si.info_digest(INFO)
+
+
+def test_compare_info_uses_saved_digest(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(si, 'CONFIG_DIR', tmp_path)
+    monkeypatch.setattr(si, 'INFO_FILE', tmp_path / 'system_info.json')
+    si.save_info(INFO)
+    prev = si.load_previous_info()
+    assert prev['digest'] == si.info_digest(INFO)
+    assert si.compare_info(prev, INFO) == {}
+    # the stored digest decides; a matching digest skips the field-by-field diff
+    assert si.compare_info(dict(prev, memory={'MemTotal_kB': 1}), INFO) == {}
+    changed = dict(INFO, memory={'MemTotal_kB': 8192})
+    assert si.compare_info(prev, changed) == {'memory_changed': {'old': 16384, 'new': 8192}}
+    assert si.compare_info(None, INFO) == {'initial_run': True}
+
+
+def test_gpu_diff_ignores_order_and_mixed_fields():
+    gpus = [{'vendor': 'NVIDIA', 'name': 'Tesla T4', 'driver': '535'},
+            {'vendor': 'AMD ROCm', 'details': ['gfx90a', 'gfx90a']},
+            {'vendor': 'Intel', 'pci_slot': '0000:00:02.0', 'pci_id': '8086:46a6'},
+            {'vendor': None, 'name': None}]
+    # entries missing name/details (or holding None) still sort without TypeError
+    keys = sorted(map(si._gpu_key, gpus))
+    assert keys[0] == ('', '', ())
+    prev = dict(INFO, gpus=gpus)
+    curr = dict(INFO, gpus=list(reversed(gpus)))
+    assert 'gpus_changed' not in si.compare_info(prev, curr)
+    # a driver update alone is not a GPU change; a different card is
+    curr = dict(INFO, gpus=[dict(gpus[0], driver='550')] + gpus[1:])
+    assert 'gpus_changed' not in si.compare_info(prev, curr)
+    curr = dict(INFO, gpus=[dict(gpus[0], name='Tesla V100')] + gpus[1:])
+    assert si.compare_info(prev, curr)['gpus_changed']['new'][-1] == ('NVIDIA', 'Tesla V100', ())
+
+
+def _isolate_gather_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(si, 'CONFIG_DIR', tmp_path)
+    monkeypatch.setattr(si, 'GATHER_CACHE_FILE', tmp_path / 'gather_cache.json')
+
+
+def test_gather_cache_keyed_on_path_and_interactive(tmp_path, monkeypatch):
+    _isolate_gather_cache(tmp_path, monkeypatch)
+    monkeypatch.setenv('PATH', '/usr/bin:/bin')
+    si._save_gather_cache(INFO)
+    assert si._load_gather_cache() == INFO
+    assert si._load_gather_cache(interactive=True) is None
+    monkeypatch.setenv('PATH', '/opt/gromacs/bin:/usr/bin:/bin')
+    assert si._load_gather_cache() is None
+
+
+def test_gather_cache_expires_after_ttl(tmp_path, monkeypatch):
+    _isolate_gather_cache(tmp_path, monkeypatch)
+    now = si.time.time()
+    si._save_gather_cache(INFO)
+    monkeypatch.setattr(si.time, 'time', lambda: now + si.GATHER_CACHE_TTL - 1)
+    assert si._load_gather_cache() == INFO
+    monkeypatch.setattr(si.time, 'time', lambda: now + si.GATHER_CACHE_TTL + 1)
+    assert si._load_gather_cache() is None
+
+
+def test_interactive_gather_does_not_write_cache(tmp_path, monkeypatch):
+    _isolate_gather_cache(tmp_path, monkeypatch)
+    for probe in ('get_cpu_info', 'get_memory_info', 'get_os_info', 'get_gpu_info', 'get_cuda_info'):
+        monkeypatch.setattr(si, probe, dict)
+    monkeypatch.setattr(si, 'check_gromacs_setup', lambda interactive=True: {})
+    si.gather_info(interactive=True)
+    assert not si.GATHER_CACHE_FILE.exists()
+    first = si.gather_info(interactive=False)
+    assert si.GATHER_CACHE_FILE.exists()
+    # a repeat non-interactive call is served from the cache without probing again
+    monkeypatch.setattr(si, 'get_cpu_info', lambda: {'model_name': 'changed'})
+    assert si.gather_info(interactive=False) == first